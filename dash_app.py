@@ -13,6 +13,21 @@ import logging
 import os
 import base64
 import io
+import hashlib
+import json
+import time
+import threading
+import atexit
+import flask
+import sqlite3
+import tempfile
+import zlib
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from sales_kernels import AGG_COLUMNS, aggregate_partition, compare_partition, filter_mask, run_shared_partition
 
 # Set up logging
 log_dir = "/tmp/automotive_dashboard"
@@ -39,13 +54,27 @@ app.title = "Automotive Analytics Dashboard"
 server = app.server
 
 # Cache generated data
+# Seeds the generators so every worker process and restart produces the same data
+DATA_SEED = int(os.environ.get('DASHBOARD_DATA_SEED', 2025))
+# Names the loaded data for saved views; change it when the data behind the app changes
+DATA_SOURCE = os.environ.get('DASHBOARD_DATA_SOURCE', f"generated-{DATA_SEED}")
 cached_data = None
 def get_data():
     global cached_data
     if cached_data is None:
+        random.seed(DATA_SEED)
+        np.random.seed(DATA_SEED)
+        Faker.seed(DATA_SEED)
         df = generate_sales_data()
+        if not df.empty:
+            # Keep sales physically ordered by Date so date ranges are contiguous slices
+            df = df.sort_values('Date', kind='stable').reset_index(drop=True)
         hr_data, inventory_data, crm_data, demo_data, time_log_data = generate_fake_data(df)
-        cached_data = (df, hr_data, inventory_data, crm_data, demo_data, time_log_data)
+        time_log_data = normalize_time_log(time_log_data)
+        raw_data = dict(zip(DATASET_NAMES, (df, hr_data, inventory_data, crm_data, demo_data, time_log_data)))
+        compact_data = {name: compact_frame(frame, DATASET_SCHEMAS[name]) for name, frame in raw_data.items()}
+        log_memory_report(raw_data, compact_data)
+        cached_data = tuple(compact_data[name] for name in DATASET_NAMES)
     return cached_data
 
 # Data generation functions
@@ -132,9 +161,1532 @@ def generate_fake_data(df):
         logging.error(f"Error generating fake data: {str(e)}")
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
+# Time log normalization
+STANDARD_SHIFT_MINUTES = 8 * 60
+LATE_ARRIVAL_MINUTES = 9 * 60
+
+def parse_clock_minutes(times):
+    """Vectorized parse of clock strings like "9:05 AM" into minutes since midnight.
+
+    Hours above 12 with a PM suffix (e.g. "16:30 PM") are read as 24-hour values.
+    """
+    parts = times.astype(str).str.extract(r'^\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])?\s*$')
+    hours = pd.to_numeric(parts[0], errors='coerce')
+    minutes = pd.to_numeric(parts[1], errors='coerce')
+    meridiem = parts[2].str.upper()
+    hours = hours.where(meridiem.isna(), hours % 12 + np.where(meridiem == 'PM', 12, 0))
+    return (hours * 60 + minutes).astype('Int16')
+
+def normalize_time_log(time_log_df):
+    """Add integer Clock In/Out minute columns and shift length so consumers never re-parse strings."""
+    if time_log_df.empty:
+        return time_log_df
+    clock_in = parse_clock_minutes(time_log_df['Clock In'])
+    clock_out = parse_clock_minutes(time_log_df['Clock Out'])
+    return time_log_df.assign(**{
+        'Clock In Minutes': clock_in,
+        'Clock Out Minutes': clock_out,
+        # Shifts that end past midnight wrap around
+        'Shift Minutes': ((clock_out - clock_in) % (24 * 60)).astype('Int16'),
+    })
+
+# Compact in-memory representation
+DATASET_NAMES = ['sales', 'hr', 'inventory', 'crm', 'demo', 'time_log']
+# Store money columns as float32 (about 7 significant digits) when set
+COMPACT_AMOUNTS = os.environ.get('DASHBOARD_FLOAT32_AMOUNTS', '0') == '1'
+
+# Column -> storage kind. 'month'/'quarter' become integer period ordinals,
+# 'amount' follows COMPACT_AMOUNTS; columns not listed are left untouched.
+DATASET_SCHEMAS = {
+    'sales': {
+        'Salesperson': 'category', 'Car Make': 'category', 'Car Model': 'category',
+        'Car Year': 'int16', 'Year': 'int16', 'Month': 'month', 'Quarter': 'quarter',
+        'Sale Price': 'amount', 'Commission Earned': 'amount',
+    },
+    'hr': {
+        'Role': 'category', 'Department': 'category',
+        'Salary (USD)': 'int32',
+    },
+    'inventory': {
+        'Car Make': 'category', 'Stock Level': 'int32', 'Reorder Level': 'int32', 'Unit Cost': 'amount',
+    },
+    'crm': {
+        'Contact Date': 'datetime', 'Interaction Type': 'category', 'Salesperson': 'category',
+    },
+    'demo': {
+        'Age Group': 'category', 'Region': 'category', 'Preferred Make': 'category',
+        'Purchase Amount': 'amount',
+    },
+    'time_log': {
+        'Employee ID': 'category', 'Clock In': 'category', 'Clock Out': 'category',
+    },
+}
+PERIOD_FREQS = {'month': 'M', 'quarter': 'Q'}
+
+def to_period_codes(values, freq):
+    """Period strings such as "2024-03" or "2024Q1" as int16 period ordinals, parsing each distinct label once."""
+    codes, labels = pd.factorize(values)
+    ordinals = pd.PeriodIndex(labels, freq=freq).asi8
+    return ordinals[codes].astype(np.int16)
+
+def period_labels(codes, freq):
+    """Render-time string labels for integer period ordinals."""
+    return pd.PeriodIndex.from_ordinals(np.asarray(codes, dtype=np.int64), freq=freq).astype(str)
+
+def with_period_labels(frame):
+    """Copy of `frame` with integer Month/Quarter columns turned back into labels."""
+    labelled = {}
+    for col, kind in (('Month', 'month'), ('Quarter', 'quarter')):
+        if col in frame and pd.api.types.is_integer_dtype(frame[col]):
+            labelled[col] = period_labels(frame[col], PERIOD_FREQS[kind])
+    return frame.assign(**labelled) if labelled else frame
+
+def with_date_labels(frame, columns):
+    """Copy of `frame` with datetime `columns` rendered as YYYY-MM-DD strings."""
+    return frame.assign(**{col: frame[col].dt.strftime('%Y-%m-%d') for col in columns})
+
+def compact_frame(frame, schema):
+    """Apply a dataset schema, skipping columns that are missing or already converted."""
+    if frame.empty:
+        return frame
+    converted = {}
+    for col, kind in schema.items():
+        if col not in frame:
+            continue
+        values = frame[col]
+        if kind == 'category':
+            converted[col] = values.astype('category')
+        elif kind in PERIOD_FREQS:
+            if not pd.api.types.is_integer_dtype(values):
+                converted[col] = to_period_codes(values, PERIOD_FREQS[kind])
+        elif kind == 'datetime':
+            converted[col] = pd.to_datetime(values)
+        elif kind == 'amount':
+            converted[col] = values.astype(np.float32 if COMPACT_AMOUNTS else np.float64)
+        else:
+            converted[col] = values.astype(kind)
+    return frame.assign(**converted)
+
+def memory_report(datasets):
+    """Deep memory usage in bytes per dataset and column."""
+    rows = []
+    for name, frame in datasets.items():
+        usage = frame.memory_usage(deep=True, index=False)
+        for col, nbytes in usage.items():
+            rows.append({'Dataset': name, 'Column': col, 'Dtype': str(frame[col].dtype), 'Bytes': int(nbytes)})
+    return pd.DataFrame(rows, columns=['Dataset', 'Column', 'Dtype', 'Bytes'])
+
+def log_memory_report(before, after):
+    report = memory_report(after).merge(
+        memory_report(before)[['Dataset', 'Column', 'Bytes']].rename(columns={'Bytes': 'Raw Bytes'}),
+        on=['Dataset', 'Column'], how='left'
+    )
+    for name, col, dtype, nbytes, raw_bytes in report.itertuples(index=False, name=None):
+        logging.debug(f"Memory {name}.{col} ({dtype}): {nbytes:,} bytes (raw {raw_bytes:,.0f})")
+    totals = report.groupby('Dataset', sort=False)[['Bytes', 'Raw Bytes']].sum()
+    for name, row in totals.iterrows():
+        ratio = row['Raw Bytes'] / row['Bytes'] if row['Bytes'] else 0
+        logging.info(f"Memory {name}: {row['Bytes']:,.0f} bytes (raw {row['Raw Bytes']:,.0f}, {ratio:.1f}x smaller)")
+    return report
+
 # Load cached data
 df, hr_data, inventory_data, crm_data, demo_data, time_log_data = get_data()
 
+# Sorted date index: epoch days aligned with the rows of the date-sorted sales frame
+def build_date_index(sales_df):
+    return sales_df['Date'].values.astype('datetime64[D]').astype(np.int64)
+
+def to_epoch_day(value):
+    """Epoch day for a date picker value ("YYYY-MM-DD" or an ISO datetime string)."""
+    if isinstance(value, str):
+        return np.datetime64(value[:10], 'D').astype(np.int64)
+    return pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype(np.int64)
+
+def date_slice(store, start_date, end_date):
+    """Contiguous row range of the store's sales between two dates (inclusive) via binary search."""
+    lo = np.searchsorted(store['days'], to_epoch_day(start_date), side='left')
+    hi = np.searchsorted(store['days'], to_epoch_day(end_date), side='right')
+    # A start after the end selects nothing, as the old boolean masks did
+    return slice(int(lo), int(max(lo, hi)))
+
+def date_bounds(store=None):
+    """First and last sale dates of a store, by default the current one, read from the ends of its index."""
+    sales_days = (store or sales_store)['days']
+    if len(sales_days) == 0:
+        return None, None
+    return (
+        pd.Timestamp(np.datetime64(int(sales_days[0]), 'D')),
+        pd.Timestamp(np.datetime64(int(sales_days[-1]), 'D'))
+    )
+
+# Result cache for expensive tab computations, keyed by filter signature
+RESULT_CACHE_SIZE = 256
+# Entries range from a few numbers to whole filtered payloads, so the cache is also bounded by size
+RESULT_CACHE_BYTES = int(float(os.environ.get('DASHBOARD_RESULT_CACHE_MB', 256)) * 2**20)
+result_cache = OrderedDict()
+result_cache_sizes = {}
+result_cache_bytes = 0
+result_cache_lock = threading.Lock()
+
+def filter_signature(filtered_data):
+    """Stable key for a serialized filtered-data payload."""
+    if not filtered_data:
+        return 'empty'
+    return hashlib.md5(filtered_data.encode('utf-8')).hexdigest()
+
+def approximate_size(value):
+    """Rough memory footprint of a cached value in bytes; strings, arrays and frames dominate."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, dict):
+        return sum(approximate_size(item) for item in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(approximate_size(item) for item in value) + 8 * len(value)
+    if hasattr(value, 'to_plotly_json'):
+        return approximate_size(value.to_plotly_json())
+    return 32
+
+def drop_cache_entry(key):
+    """Remove a result cache entry and its size; the caller holds result_cache_lock."""
+    global result_cache_bytes
+    if key in result_cache:
+        del result_cache[key]
+        result_cache_bytes -= result_cache_sizes.pop(key, 0)
+
+def cache_get(key):
+    with result_cache_lock:
+        if key in result_cache:
+            result_cache.move_to_end(key)
+            return result_cache[key]
+    return None
+
+def cache_put(key, value):
+    global result_cache_bytes
+    size = approximate_size(value)
+    with result_cache_lock:
+        drop_cache_entry(key)
+        result_cache[key] = value
+        result_cache_sizes[key] = size
+        result_cache_bytes += size
+        # Least recently used first; a value larger than the whole budget is returned but not kept
+        while result_cache and (len(result_cache) > RESULT_CACHE_SIZE or result_cache_bytes > RESULT_CACHE_BYTES):
+            drop_cache_entry(next(iter(result_cache)))
+    return value
+
+# Single-flight: concurrent identical computations run once and share the result
+SINGLE_FLIGHT_TIMEOUT = float(os.environ.get('DASHBOARD_SINGLE_FLIGHT_TIMEOUT', 30))
+in_flight = {}
+in_flight_lock = threading.Lock()
+
+def single_flight(key, compute, timeout=SINGLE_FLIGHT_TIMEOUT):
+    """Run `compute` once per `key` among concurrent callers; the others wait for its result.
+
+    A waiter that gives up after `timeout` seconds computes on its own instead.
+    """
+    with in_flight_lock:
+        flight = in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = in_flight[key] = Future()
+    if not leader:
+        try:
+            return flight.result(timeout=timeout)
+        except FutureTimeoutError:
+            logging.warning(f"Single-flight wait timed out for {key[0]}, computing independently")
+            return compute()
+    try:
+        result = compute()
+        flight.set_result(result)
+        return result
+    except BaseException as e:
+        flight.set_exception(e)
+        raise
+    finally:
+        with in_flight_lock:
+            in_flight.pop(key, None)
+
+def cached_compute(key, compute):
+    """Result-cache lookup that coalesces concurrent misses for the same key."""
+    value = cache_get(key)
+    if value is not None:
+        return value
+    def compute_once():
+        # A flight that finished just before this one started has already filled the cache
+        value = cache_get(key)
+        if value is not None:
+            return value
+        version = sales_store['version']
+        value = compute()
+        # An ingest published meanwhile may already have run its eviction, so a result that
+        # could come from the previous store is returned without being cached
+        return cache_put(key, value) if sales_store['version'] == version else value
+    return single_flight(key, compute_once)
+
+# Binary figure payloads: numeric trace arrays ship as base64 typed arrays that plotly.js decodes natively
+TYPED_ARRAY_MIN_LENGTH = int(os.environ.get('DASHBOARD_TYPED_ARRAY_MIN', 32))
+# Largest absolute error a float32 downcast may introduce by default (half a cent, as
+# hover labels print amounts to cents); figures with coarser labels pass their own
+FIGURE_FLOAT_TOLERANCE = 0.005
+PLOTLY_DTYPES = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8'
+}
+INTEGER_DTYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+def downcast_array(values, tolerance=FIGURE_FLOAT_TOLERANCE):
+    """Smallest plotly.js dtype that holds `values` to within `tolerance`."""
+    if values.dtype.kind in 'iu' or (
+        values.dtype.kind == 'f' and np.isfinite(values).all() and np.array_equal(values, np.round(values))
+    ):
+        lo, hi = values.min(), values.max()
+        for dtype in INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(dtype)
+    values = values.astype(np.float64)
+    narrow = values.astype(np.float32)
+    finite = np.isfinite(values)
+    if np.all(np.abs(narrow[finite] - values[finite]) <= tolerance):
+        return narrow
+    return values
+
+def to_typed_array(values, tolerance=FIGURE_FLOAT_TOLERANCE):
+    """`{dtype, bdata[, shape]}` spec for a numeric array, or None to leave it as JSON."""
+    try:
+        values = np.asarray(values)
+    except ValueError:
+        return None
+    if values.dtype.kind not in 'iuf' or values.size < TYPED_ARRAY_MIN_LENGTH:
+        return None
+    values = downcast_array(values, tolerance)
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    spec = {'dtype': PLOTLY_DTYPES[values.dtype.name], 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
+
+def encode_arrays(node, tolerance):
+    if isinstance(node, dict):
+        return {key: encode_arrays(value, tolerance) for key, value in node.items()}
+    if isinstance(node, (list, tuple, np.ndarray)):
+        spec = to_typed_array(node, tolerance)
+        return spec if spec is not None else node
+    return node
+
+def encode_figure(fig, tolerance=FIGURE_FLOAT_TOLERANCE):
+    """Figure dict whose trace data arrays are binary typed arrays; layout is left as is."""
+    figure = fig.to_plotly_json() if hasattr(fig, 'to_plotly_json') else dict(fig)
+    figure['data'] = [encode_arrays(trace, tolerance) for trace in figure.get('data', [])]
+    return figure
+
+# Partitioned sales aggregation, parallel above PARALLEL_ROW_THRESHOLD rows
+PARALLEL_ROW_THRESHOLD = int(os.environ.get('DASHBOARD_PARALLEL_ROWS', 1_000_000))
+AGG_PROCESSES = int(os.environ.get('DASHBOARD_AGG_PROCESSES', os.cpu_count() or 1))
+
+def build_sales_columns(sales_df):
+    """Plain numpy arrays for aggregation; categoricals are reduced to their integer codes."""
+    columns = {}
+    for col in AGG_COLUMNS:
+        values = sales_df[col]
+        columns[col] = values.cat.codes.to_numpy() if isinstance(values.dtype, pd.CategoricalDtype) else values.to_numpy()
+    months = columns['Month']
+    columns['month_base'] = int(months.min()) if len(months) else 0
+    columns['n_months'] = int(months.max()) - columns['month_base'] + 1 if len(months) else 0
+    return columns
+
+def filter_codes(store, salesperson, car_make, car_model, car_year):
+    """Dropdown selections as equality filters on the integer columns of the store."""
+    codes = {}
+    for col, value in (('Salesperson', salesperson), ('Car Make', car_make), ('Car Model', car_model)):
+        if value != 'All':
+            categories = store['df'][col].cat.categories
+            # -2 never matches a code, so unknown values yield an empty selection
+            codes[col] = categories.get_loc(value) if value in categories else -2
+    if car_year != 'All':
+        codes['Car Year'] = int(car_year)
+    return codes
+
+def merge_partials(partials):
+    merged = dict(partials[0])
+    for part in partials[1:]:
+        for key, value in part.items():
+            merged[key] = merged[key] + value
+    return merged
+
+# The installed generation of shared columns and replaced ones that pool tasks still read
+shared_store = {'current': None, 'retired': []}
+shared_store_lock = threading.Lock()
+agg_pool = None
+
+def share_columns(columns):
+    """Copy aggregation columns into shared memory so pool workers read them without pickling."""
+    meta = {key: value for key, value in columns.items() if not isinstance(value, np.ndarray)}
+    blocks = []
+    for col in AGG_COLUMNS:
+        values = np.ascontiguousarray(columns[col])
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+        meta[col] = (block.name, values.dtype.str, len(values))
+        blocks.append(block)
+    return {'columns': columns, 'meta': meta, 'blocks': blocks, 'users': 0}
+
+def unlink_shared_blocks(shared):
+    for block in shared['blocks']:
+        block.close()
+        block.unlink()
+
+def install_shared_columns(shared):
+    """Make a share_columns() generation current; the caller holds shared_store_lock."""
+    if shared_store['current'] is not None:
+        shared_store['retired'].append(shared_store['current'])
+    # Replaced generations stay mapped until the last pool task reading them is done
+    for old in shared_store['retired']:
+        if old['users'] == 0:
+            unlink_shared_blocks(old)
+    shared_store['retired'] = [old for old in shared_store['retired'] if old['users'] > 0]
+    shared_store['current'] = shared
+
+def acquire_shared_columns(columns):
+    """The shared-memory generation holding `columns`, or None if another one is installed.
+
+    A returned generation stays mapped until it is passed to release_shared_generation().
+    """
+    with shared_store_lock:
+        # ingest_sales publishes under this lock, so only the current columns get shared lazily
+        if shared_store['current'] is None and columns is sales_store['columns']:
+            install_shared_columns(share_columns(columns))
+        shared = shared_store['current']
+        if shared is None or shared['columns'] is not columns:
+            return None
+        shared['users'] += 1
+        return shared
+
+def release_shared_generation(shared):
+    with shared_store_lock:
+        shared['users'] -= 1
+        if shared['users'] == 0 and any(old is shared for old in shared_store['retired']):
+            shared_store['retired'] = [old for old in shared_store['retired'] if old is not shared]
+            unlink_shared_blocks(shared)
+
+def release_shared_columns():
+    with shared_store_lock:
+        for shared in [shared_store['current']] + shared_store['retired']:
+            if shared is not None:
+                unlink_shared_blocks(shared)
+        shared_store.update(current=None, retired=[])
+
+def get_agg_pool():
+    global agg_pool
+    with shared_store_lock:
+        if agg_pool is None:
+            # Workers start from a clean interpreter rather than a fork of this multi-threaded
+            # process, whose locks may be held by the warmer, ingest or request threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            if context.get_start_method() == 'forkserver':
+                context.set_forkserver_preload(['sales_kernels'])
+            agg_pool = ProcessPoolExecutor(max_workers=AGG_PROCESSES, mp_context=context)
+            atexit.register(agg_pool.shutdown, wait=False, cancel_futures=True)
+            atexit.register(release_shared_columns)
+        return agg_pool
+
+def map_partitions(partition, columns, lo, hi, *args):
+    """Split rows [lo, hi) into contiguous blocks, run `partition` on each in the pool and merge.
+
+    A snapshot whose columns were replaced by an ingest meanwhile is reduced in-process.
+    """
+    shared = acquire_shared_columns(columns)
+    if shared is None:
+        return partition(columns, lo, hi, *args)
+    try:
+        bounds = np.linspace(lo, hi, AGG_PROCESSES * 2 + 1).astype(int)
+        futures = [
+            get_agg_pool().submit(run_shared_partition, partition, shared['meta'], int(start), int(stop), *args)
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+        return merge_partials([future.result() for future in futures])
+    finally:
+        release_shared_generation(shared)
+
+def aggregate_sales(store, rows, filters, mask=None):
+    """Totals and monthly sums for the store's sales rows in `rows` matching `filters`.
+
+    Large ranges are split into contiguous row blocks and mapped over the process pool,
+    with partial results merged here; small ranges are reduced in-process.
+    """
+    columns = store['columns']
+    lo, hi = rows.start, rows.stop
+    if hi - lo < PARALLEL_ROW_THRESHOLD or AGG_PROCESSES < 2:
+        result = aggregate_partition(columns, lo, hi, filters, mask)
+    else:
+        result = map_partitions(aggregate_partition, columns, lo, hi, filters)
+
+    present = result['month_count'] > 0
+    result['monthly'] = pd.DataFrame({
+        'Month': (np.flatnonzero(present) + columns['month_base']).astype(np.int16),
+        'Sale Price': result['month_sale'][present],
+        'Commission Earned': result['month_commission'][present],
+    })
+    return result
+
+# Everything a reader needs about the sales rows, taken once per request. ingest_sales builds a
+# new dict and publishes it with a single assignment; a published store is never modified.
+sales_store = {
+    'df': df,
+    'days': build_date_index(df) if not df.empty else np.empty(0, dtype=np.int64),
+    'columns': build_sales_columns(df) if not df.empty else None,
+    # Bumped when a batch lands inside the history and shifts row positions
+    'epoch': 0,
+    # Id of the last ingest log batch applied in this process, the same in every worker once caught up
+    'version': 0,
+}
+
+# A/B comparison: two filter sets labelled and aggregated in a single pass
+COMPARE_LABELS = {'A': [1, 3], 'B': [2, 3], 'both': [3]}
+
+def compare_sales(store, side_a, side_b):
+    """Totals per label and month-aligned A/B series from one pass over both row ranges.
+
+    Each side is (rows, filters, start_month). B's months are shifted by the gap between
+    the two start months, so this year lines up against last year month by month.
+    """
+    (rows_a, filters_a, start_a), (rows_b, filters_b, start_b) = side_a, side_b
+    lo, hi = min(rows_a.start, rows_b.start), max(rows_a.stop, rows_b.stop)
+    args = ((rows_a.start, rows_a.stop), filters_a), ((rows_b.start, rows_b.stop), filters_b)
+    columns = store['columns']
+    if hi - lo < PARALLEL_ROW_THRESHOLD or AGG_PROCESSES < 2:
+        cells = compare_partition(columns, lo, hi, *args)
+    else:
+        cells = map_partitions(compare_partition, columns, lo, hi, *args)
+    n_months, base = columns['n_months'], columns['month_base']
+    grid = {key: values.reshape(4, n_months) for key, values in cells.items()}
+
+    result = {
+        name: {
+            'count': int(grid['count'][labels].sum()),
+            'sale_sum': float(grid['sale'][labels].sum()),
+            'commission_sum': float(grid['commission'][labels].sum()),
+        }
+        for name, labels in COMPARE_LABELS.items()
+    }
+    shift = start_a - start_b
+    series = []
+    for name, offset in (('A', 0), ('B', shift)):
+        labels = COMPARE_LABELS[name]
+        present = grid['count'][labels].sum(axis=0) > 0
+        series.append(pd.DataFrame({
+            'Month': np.flatnonzero(present) + base + offset,
+            f'Sale Price {name}': grid['sale'][labels].sum(axis=0)[present],
+            f'Commission Earned {name}': grid['commission'][labels].sum(axis=0)[present],
+        }).set_index('Month'))
+    monthly = series[0].join(series[1], how='outer').fillna(0.0).reset_index()
+    monthly['B Month'] = (monthly['Month'] - shift).astype(np.int16)
+    monthly['Month'] = monthly['Month'].astype(np.int16)
+    result['monthly'] = monthly
+    result['shift'] = shift
+    return result
+
+# Trend analytics
+ROLLING_WINDOWS = [7, 30, 90]
+
+def compute_trend_series(filtered_df, metric, slice_by=None):
+    """Rolling, cumulative and YoY series for `metric`, optionally sliced by `slice_by`.
+
+    Rows are bucketed into a dense (group, day) grid with a single bincount, so every
+    rolling window is a difference of one cumulative sum instead of a separate scan.
+    """
+    dates = pd.to_datetime(filtered_df['Date']).values.astype('datetime64[D]')
+    values = filtered_df[metric].to_numpy(dtype=float)
+    first_day = dates.min()
+    day_idx = (dates - first_day).astype(np.int64)
+    n_days = int(day_idx.max()) + 1
+
+    if slice_by:
+        codes, labels = pd.factorize(filtered_df[slice_by], sort=True)
+        labels = list(labels)
+    else:
+        codes, labels = np.zeros(len(filtered_df), dtype=np.int64), ['All']
+    n_groups = len(labels)
+
+    flat = codes * n_days + day_idx
+    daily_sum = np.bincount(flat, weights=values, minlength=n_groups * n_days).reshape(n_groups, n_days)
+    daily_count = np.bincount(flat, minlength=n_groups * n_days).reshape(n_groups, n_days)
+    cum_sum = np.concatenate([np.zeros((n_groups, 1)), daily_sum.cumsum(axis=1)], axis=1)
+    cum_count = np.concatenate([np.zeros((n_groups, 1)), daily_count.cumsum(axis=1)], axis=1)
+
+    upper = np.arange(1, n_days + 1)
+    rolling = {}
+    for window in ROLLING_WINDOWS:
+        lower = np.maximum(upper - window, 0)
+        window_sum = cum_sum[:, upper] - cum_sum[:, lower]
+        window_count = cum_count[:, upper] - cum_count[:, lower]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            window_mean = np.where(window_count > 0, window_sum / window_count, np.nan)
+        rolling[window] = {'sum': window_sum, 'mean': window_mean}
+
+    # Month buckets come from the same day index, so YoY is a 12-step shift
+    months = dates.astype('datetime64[M]')
+    first_month = months.min()
+    month_idx = (months - first_month).astype(np.int64)
+    n_months = int(month_idx.max()) + 1
+    monthly = np.bincount(
+        codes * n_months + month_idx, weights=values, minlength=n_groups * n_months
+    ).reshape(n_groups, n_months)
+    yoy_delta = np.full_like(monthly, np.nan)
+    yoy_delta[:, 12:] = monthly[:, 12:] - monthly[:, :-12]
+
+    return {
+        'labels': labels,
+        'days': pd.date_range(pd.Timestamp(first_day), periods=n_days, freq='D'),
+        'months': pd.period_range(pd.Timestamp(first_month), periods=n_months, freq='M').astype(str),
+        'cumulative': cum_sum[:, 1:],
+        'rolling': rolling,
+        'monthly': monthly,
+        'yoy_delta': yoy_delta,
+    }
+
+# Inventory reorder engine
+VELOCITY_WINDOW_DAYS = 90
+STOCKOUT_ALERT_DAYS = 30
+
+def build_reorder_state(sales_df, parts_df):
+    """Prebuild the Car Make hash index over parts and fold in the full sales history."""
+    makes = pd.Index(sorted(set(sales_df['Car Make'].dropna()) | set(parts_df['Car Make'].dropna())))
+    part_codes = makes.get_indexer(parts_df['Car Make'])
+    # Part row positions grouped by make code, so a make's parts are one slice away
+    order = np.argsort(part_codes, kind='stable')
+    bounds = np.searchsorted(part_codes[order], np.arange(len(makes) + 1))
+    n_parts = len(parts_df)
+    state = {
+        'makes': makes,
+        'part_codes': part_codes,
+        'parts_by_make': [order[bounds[c]:bounds[c + 1]] for c in range(len(makes))],
+        'first_day': pd.to_datetime(sales_df['Date']).min().to_datetime64().astype('datetime64[D]'),
+        'daily_units': np.zeros((len(makes), 0), dtype=np.int64),
+        'velocity': np.zeros(len(makes)),
+        'stock': parts_df['Stock Level'].to_numpy(dtype=float),
+        'reorder_level': parts_df['Reorder Level'].to_numpy(dtype=float),
+        'daily_demand': np.zeros(n_parts),
+        'days_to_stockout': np.full(n_parts, np.nan),
+        'status': np.full(n_parts, 'OK', dtype=object),
+    }
+    update_reorder_state(state, sales_df)
+    return state
+
+def update_reorder_state(state, new_sales):
+    """Fold `new_sales` into the per-make daily unit counts and re-project only the makes they touch."""
+    codes = state['makes'].get_indexer(new_sales['Car Make'])
+    dates = pd.to_datetime(new_sales['Date']).values.astype('datetime64[D]')
+    # Unknown makes and sales before the tracked history cannot move a projection
+    known = (codes >= 0) & (dates >= state['first_day'])
+    codes, days = codes[known], (dates[known] - state['first_day']).astype(np.int64)
+    if len(codes) == 0:
+        return []
+
+    daily_units = state['daily_units']
+    n_makes, old_days = daily_units.shape
+    n_days = max(old_days, int(days.max()) + 1)
+    if n_days > old_days:
+        daily_units = np.pad(daily_units, ((0, 0), (0, n_days - old_days)))
+    daily_units += np.bincount(codes * n_days + days, minlength=n_makes * n_days).reshape(n_makes, n_days)
+    state['daily_units'] = daily_units
+
+    # A later last sale day slides every make's window, otherwise only touched makes move
+    changed = np.arange(n_makes) if n_days > old_days else np.unique(codes)
+    window = min(VELOCITY_WINDOW_DAYS, n_days)
+    state['velocity'][changed] = daily_units[changed, n_days - window:].sum(axis=1) / window
+
+    rows = np.concatenate([state['parts_by_make'][c] for c in changed])
+    demand = state['velocity'][state['part_codes'][rows]]
+    stock = state['stock'][rows]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_left = np.where(demand > 0, stock / demand, np.nan)
+    state['daily_demand'][rows] = demand
+    state['days_to_stockout'][rows] = days_left
+    state['status'][rows] = np.select(
+        [stock <= state['reorder_level'][rows], days_left <= STOCKOUT_ALERT_DAYS],
+        ['Reorder Now', 'At Risk'],
+        default='OK'
+    )
+    return list(state['makes'][changed])
+
+def reorder_view(parts_df, state):
+    """Inventory rows joined with projected demand, days to stockout and reorder status."""
+    days_left = pd.Series(state['days_to_stockout'], index=parts_df.index).round(1)
+    return parts_df.assign(**{
+        'Daily Demand': np.round(state['daily_demand'], 2),
+        'Days to Stockout': days_left.astype(object).where(days_left.notna(), None),
+        'Reorder Status': state['status'],
+    })
+
+reorder_state = build_reorder_state(df, inventory_data) if not inventory_data.empty else None
+
+# Customer fact table
+DEMO_DIMENSIONS = ['Age Group', 'Region', 'Preferred Make']
+
+def build_customer_facts(crm_df, demo_df):
+    """Join CRM and demographics once through an integer surrogate key and pre-aggregate
+    purchase amount and satisfaction per (Age Group, Region, Preferred Make) cell."""
+    customer_ids = pd.Index(pd.unique(np.concatenate([
+        demo_df['Customer ID'].to_numpy(), crm_df['Customer ID'].to_numpy()
+    ])))
+    n_customers = len(customer_ids)
+    demo_key = customer_ids.get_indexer(demo_df['Customer ID'])
+    crm_key = customer_ids.get_indexer(crm_df['Customer ID'])
+
+    # Per-customer satisfaction from any number of CRM interactions
+    sat_sum = np.bincount(crm_key, weights=crm_df['Satisfaction Score'].to_numpy(dtype=float), minlength=n_customers)
+    sat_count = np.bincount(crm_key, minlength=n_customers)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        satisfaction = np.where(sat_count > 0, sat_sum / sat_count, np.nan)
+    table = demo_df.assign(**{
+        'Customer Key': demo_key,
+        'Satisfaction Score': satisfaction[demo_key],
+        'Interactions': sat_count[demo_key],
+    })
+
+    codes, labels = [], {}
+    for dim in DEMO_DIMENSIONS:
+        dim_codes, dim_labels = pd.factorize(table[dim], sort=True)
+        codes.append(dim_codes)
+        labels[dim] = list(dim_labels)
+    shape = tuple(len(labels[dim]) for dim in DEMO_DIMENSIONS)
+    cell = np.ravel_multi_index(codes, shape)
+    size = int(np.prod(shape))
+    has_sat = ~np.isnan(table['Satisfaction Score'].to_numpy())
+
+    def cube(weights=None, mask=None):
+        idx = cell if mask is None else cell[mask]
+        w = weights if mask is None or weights is None else weights[mask]
+        return np.bincount(idx, weights=w, minlength=size).reshape(shape)
+
+    return {
+        'table': table,
+        'labels': labels,
+        'customers': cube(),
+        'purchase_sum': cube(table['Purchase Amount'].to_numpy(dtype=float)),
+        'satisfaction_sum': cube(table['Satisfaction Score'].to_numpy(dtype=float), has_sat),
+        'satisfaction_count': cube(mask=has_sat),
+    }
+
+def customer_rollup(facts, dims):
+    """Average purchase amount and satisfaction over `dims`, summed from the pre-aggregated cube."""
+    other_axes = tuple(i for i, dim in enumerate(DEMO_DIMENSIONS) if dim not in dims)
+    order = sorted(dims, key=DEMO_DIMENSIONS.index)
+    customers = facts['customers'].sum(axis=other_axes)
+    purchase = facts['purchase_sum'].sum(axis=other_axes)
+    sat_sum = facts['satisfaction_sum'].sum(axis=other_axes)
+    sat_count = facts['satisfaction_count'].sum(axis=other_axes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            'labels': [facts['labels'][dim] for dim in order],
+            'customers': customers,
+            'avg_purchase': np.where(customers > 0, purchase / customers, np.nan),
+            'avg_satisfaction': np.where(sat_count > 0, sat_sum / sat_count, np.nan),
+        }
+
+customer_facts = build_customer_facts(crm_data, demo_data) if not demo_data.empty else None
+
+# Per-employee HR aggregates
+def build_hr_summary(hr_df, time_log_df):
+    """Hours, overtime and attendance per employee, reduced over integer employee codes
+    and joined to salary and performance by position in `hr_df`."""
+    employees = pd.Index(hr_df['Employee ID'])
+    n_employees = len(employees)
+    codes = employees.get_indexer(time_log_df['Employee ID'])
+    shift = time_log_df['Shift Minutes'].to_numpy(dtype=float, na_value=np.nan)
+    clock_in = time_log_df['Clock In Minutes'].to_numpy(dtype=float, na_value=np.nan)
+    days = pd.to_datetime(time_log_df['Date']).values.astype('datetime64[D]').astype(np.int64)
+    valid = (codes >= 0) & ~np.isnan(shift)
+    codes, shift, clock_in, days = codes[valid], shift[valid], clock_in[valid], days[valid]
+
+    worked = np.bincount(codes, weights=shift, minlength=n_employees) / 60
+    overtime = np.bincount(codes, weights=np.maximum(shift - STANDARD_SHIFT_MINUTES, 0), minlength=n_employees) / 60
+    shifts = np.bincount(codes, minlength=n_employees)
+    late = np.bincount(codes, weights=clock_in > LATE_ARRIVAL_MINUTES, minlength=n_employees)
+
+    # Attendance counts distinct (employee, day) pairs against the days the log covers
+    if len(days):
+        day_codes = days - days.min()
+        span = int(day_codes.max()) + 1
+        present_pairs = np.unique(codes.astype(np.int64) * span + day_codes)
+        days_present = np.bincount(present_pairs // span, minlength=n_employees)
+        scheduled_days = len(np.unique(day_codes))
+    else:
+        days_present, scheduled_days = np.zeros(n_employees, dtype=np.int64), 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        attendance = days_present / scheduled_days * 100 if scheduled_days else np.zeros(n_employees)
+    return hr_df[['Employee ID', 'Name', 'Role', 'Department', 'Salary (USD)', 'Performance Score']].assign(**{
+        'Shifts': shifts,
+        'Hours Worked': worked.round(1),
+        'Overtime Hours': overtime.round(1),
+        'Late Arrivals': late.astype(np.int64),
+        'Attendance (%)': np.round(attendance, 1),
+    })
+
+hr_summary = build_hr_summary(hr_data, time_log_data) if not hr_data.empty else None
+
+# Model distribution sketches: fixed-bin histograms per (Car Model, Car Year, Month)
+SKETCH_BINS = int(os.environ.get('DASHBOARD_SKETCH_BINS', 256))
+SKETCH_METRICS = ['Sale Price', 'Commission Earned']
+SKETCH_GROUP_BY = ['Car Model', 'Car Year']
+
+def build_model_sketches(sales_df):
+    """Bin edges spanning each metric's loaded range, and histograms for the full history.
+
+    Later values outside the edges land in the end bins; group min/max stay exact.
+    """
+    edges = {}
+    for metric in SKETCH_METRICS:
+        values = sales_df[metric].to_numpy(dtype=np.float64)
+        lo, hi = np.floor(values.min()), np.ceil(values.max())
+        edges[metric] = np.linspace(lo, max(hi, lo + 1), SKETCH_BINS + 1)
+    sketches = {
+        'edges': edges,
+        'index': {},
+        'Car Make': np.empty(0, dtype=object),
+        'Car Model': np.empty(0, dtype=object),
+        'Car Year': np.empty(0, dtype=np.int64),
+        'Month': np.empty(0, dtype=np.int64),
+        'counts': {metric: np.zeros((0, SKETCH_BINS), dtype=np.int32) for metric in SKETCH_METRICS},
+        'sum': {metric: np.zeros(0) for metric in SKETCH_METRICS},
+        'min': {metric: np.zeros(0) for metric in SKETCH_METRICS},
+        'max': {metric: np.zeros(0) for metric in SKETCH_METRICS},
+    }
+    update_model_sketches(sketches, sales_df)
+    return sketches
+
+def sketch_bins(values, edges):
+    return np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+
+def update_model_sketches(sketches, new_sales):
+    """Add `new_sales` to their groups' histograms, creating groups seen for the first time."""
+    keys = pd.DataFrame({
+        'Car Make': new_sales['Car Make'].astype(str).to_numpy(),
+        'Car Model': new_sales['Car Model'].astype(str).to_numpy(),
+        'Car Year': new_sales['Car Year'].to_numpy(dtype=np.int64),
+        'Month': new_sales['Month'].to_numpy(dtype=np.int64),
+    })
+    if keys.empty:
+        return
+    group_cols = ['Car Model', 'Car Year', 'Month']
+    codes = keys.groupby(group_cols, sort=False).ngroup().to_numpy()
+    first = keys.drop_duplicates(group_cols)
+    index = sketches['index']
+    n_old = len(index)
+    rows = np.array([
+        index.setdefault((model, int(year), int(month)), len(index))
+        for model, year, month in first[group_cols].itertuples(index=False, name=None)
+    ])
+    created = rows >= n_old
+    if created.any():
+        n_new = int(created.sum())
+        for col in ['Car Make'] + group_cols:
+            sketches[col] = np.concatenate([sketches[col], first[col].to_numpy(dtype=sketches[col].dtype)[created]])
+        for metric in SKETCH_METRICS:
+            sketches['counts'][metric] = np.vstack([sketches['counts'][metric], np.zeros((n_new, SKETCH_BINS), dtype=np.int32)])
+            sketches['sum'][metric] = np.concatenate([sketches['sum'][metric], np.zeros(n_new)])
+            sketches['min'][metric] = np.concatenate([sketches['min'][metric], np.full(n_new, np.inf)])
+            sketches['max'][metric] = np.concatenate([sketches['max'][metric], np.full(n_new, -np.inf)])
+
+    group_rows = rows[codes]
+    for metric in SKETCH_METRICS:
+        values = new_sales[metric].to_numpy(dtype=np.float64)
+        np.add.at(sketches['counts'][metric], (group_rows, sketch_bins(values, sketches['edges'][metric])), 1)
+        np.add.at(sketches['sum'][metric], group_rows, values)
+        np.minimum.at(sketches['min'][metric], group_rows, values)
+        np.maximum.at(sketches['max'][metric], group_rows, values)
+
+def month_windows(start_date, end_date):
+    """Whole months inside [start_date, end_date] as an ordinal range, and the partial-month date windows."""
+    start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+    first_full = start.to_period('M') + (0 if start.day == 1 else 1)
+    last_full = end.to_period('M') - (0 if end.is_month_end else 1)
+    if first_full > last_full:
+        return None, [(start, end)]
+    partial = []
+    if start.day != 1:
+        partial.append((start, start.to_period('M').end_time.normalize()))
+    if not end.is_month_end:
+        partial.append((end.to_period('M').start_time, end))
+    return (first_full.ordinal, last_full.ordinal), partial
+
+def histogram_quantiles(counts, edges, q):
+    """Quantile `q` for each histogram row: the midpoint of the bin holding the inverted-CDF
+    order statistic, so it is never more than half a bin width away from it.
+
+    Interpolating inside the bin looks smoother but can be off by a whole bin when the
+    bin's values sit at one edge.
+    """
+    cumulative = np.cumsum(counts, axis=1)
+    target = q * cumulative[:, -1]
+    idx = np.minimum((cumulative < target[:, None]).sum(axis=1), counts.shape[1] - 1)
+    return (edges[idx] + edges[idx + 1]) / 2
+
+def model_distributions(key, metric, group_by):
+    """Merged histograms and summary statistics of `metric` per `group_by` value for a filter selection.
+
+    Whole months come from the sketches. Partial months at the ends of the date range are
+    binned from their rows; a salesperson filter, which the sketches do not key on, bins
+    every row in range.
+    """
+    salesperson, car_make, car_model, car_year, start_date, end_date = key
+    edges = model_sketches['edges'][metric]
+
+    if salesperson == 'All':
+        months, windows = month_windows(start_date, end_date) if start_date and end_date else ((None, None), [])
+        selected = np.full(len(model_sketches['Month']), months is not None)
+        if months is not None and months[0] is not None:
+            selected &= (model_sketches['Month'] >= months[0]) & (model_sketches['Month'] <= months[1])
+        for col, value in (('Car Make', car_make), ('Car Model', car_model), ('Car Year', car_year)):
+            if value != 'All':
+                selected &= model_sketches[col] == (int(value) if col == 'Car Year' else value)
+    else:
+        selected = np.zeros(len(model_sketches['Month']), dtype=bool)
+        windows = [(start_date, end_date)] if start_date and end_date else [None]
+
+    store = sales_store
+    sales_columns = store['columns']
+    filters = filter_codes(store, salesperson, car_make, car_model, car_year)
+    row_labels, row_values = [], []
+    for window in windows:
+        rows = date_slice(store, *window) if window else slice(0, len(store['days']))
+        mask = filter_mask(sales_columns, rows.start, rows.stop, filters)
+        labels = sales_columns[group_by][rows][mask]
+        if group_by == 'Car Model':
+            labels = store['df']['Car Model'].cat.categories.to_numpy(dtype=object)[labels]
+        row_labels.append(labels.astype(object) if group_by == 'Car Model' else labels.astype(np.int64).astype(object))
+        row_values.append(sales_columns[metric][rows][mask].astype(np.float64))
+    row_values = np.concatenate(row_values) if row_values else np.zeros(0)
+
+    group_labels = model_sketches[group_by][selected].astype(object)
+    codes, uniques = pd.factorize(np.concatenate([group_labels] + row_labels), sort=True)
+    group_codes, row_codes = codes[:len(group_labels)], codes[len(group_labels):]
+    n = len(uniques)
+    counts = np.zeros((n, SKETCH_BINS), dtype=np.int64)
+    np.add.at(counts, group_codes, model_sketches['counts'][metric][selected])
+    np.add.at(counts, (row_codes, sketch_bins(row_values, edges)), 1)
+    sums = (
+        np.bincount(group_codes, weights=model_sketches['sum'][metric][selected], minlength=n)
+        + np.bincount(row_codes, weights=row_values, minlength=n)
+    )
+    lows, highs = np.full(n, np.inf), np.full(n, -np.inf)
+    np.minimum.at(lows, group_codes, model_sketches['min'][metric][selected])
+    np.minimum.at(lows, row_codes, row_values)
+    np.maximum.at(highs, group_codes, model_sketches['max'][metric][selected])
+    np.maximum.at(highs, row_codes, row_values)
+
+    present = counts.sum(axis=1) > 0
+    counts, sums, lows, highs = counts[present], sums[present], lows[present], highs[present]
+    total = counts.sum(axis=1)
+    stats = {'labels': [str(label) for label in np.asarray(uniques, dtype=object)[present]], 'counts': counts, 'count': total}
+    for name, q in (('q1', 0.25), ('median', 0.5), ('q3', 0.75), ('p90', 0.9)):
+        stats[name] = np.clip(histogram_quantiles(counts, edges, q), lows, highs)
+    stats.update(mean=sums / np.maximum(total, 1), min=lows, max=highs, edges=edges)
+    return stats
+
+model_sketches = build_model_sketches(df) if not df.empty else None
+
+# Vehicle hierarchy rollup: Car Make -> Car Model -> Car Year leaves by month
+VEHICLE_LEVELS = ['Car Make', 'Car Model', 'Car Year']
+
+def build_vehicle_rollup(sales_df):
+    """Units and revenue per (make, model, year) leaf and month, with the node tree over the leaves."""
+    rollup = {'leaves': None, 'month_base': int(sales_df['Month'].min()), 'n_months': 0}
+    update_vehicle_rollup(rollup, sales_df)
+    return rollup
+
+def vehicle_leaf_keys(makes, models, years):
+    return pd.MultiIndex.from_arrays(
+        [np.asarray(makes, dtype=object), np.asarray(models, dtype=object), np.asarray(years, dtype=np.int64)],
+        names=VEHICLE_LEVELS
+    )
+
+def build_vehicle_nodes(rollup):
+    """ids/parents/labels for makes, models and leaves, plus each leaf's model and make node."""
+    leaves = rollup['leaves']
+    makes = leaves.get_level_values('Car Make').to_numpy(dtype=object)
+    models = leaves.get_level_values('Car Model').to_numpy(dtype=object)
+    years = leaves.get_level_values('Car Year').astype(str).to_numpy(dtype=object)
+    model_ids = makes + '/' + models
+    make_of_leaf, make_ids = pd.factorize(makes)
+    model_of_leaf, model_uniques = pd.factorize(model_ids)
+    n_makes, n_models = len(make_ids), len(model_uniques)
+    first_leaf = np.unique(model_of_leaf, return_index=True)[1]
+    rollup.update(
+        ids=np.concatenate([make_ids, model_uniques, model_ids + '/' + years]).astype(object),
+        labels=np.concatenate([make_ids, models[first_leaf], years]).astype(object),
+        parents=np.concatenate([np.full(n_makes, '', dtype=object), makes[first_leaf], model_ids]).astype(object),
+        make_node=make_of_leaf,
+        model_node=n_makes + model_of_leaf,
+        leaf_node=n_makes + n_models + np.arange(len(leaves)),
+    )
+
+def update_vehicle_rollup(rollup, new_sales):
+    """Add `new_sales` to their leaf/month cells, growing the leaf set and month axis as needed."""
+    if new_sales.empty:
+        return
+    keys = vehicle_leaf_keys(new_sales['Car Make'].astype(str), new_sales['Car Model'].astype(str), new_sales['Car Year'])
+    months = new_sales['Month'].to_numpy(dtype=np.int64)
+    base, n_months = rollup['month_base'], rollup['n_months']
+    lo, hi = min(base, int(months.min())), max(base + n_months - 1, int(months.max()))
+    if rollup['leaves'] is None:
+        rollup['leaves'] = keys.unique().sort_values()
+        rollup['units'] = np.zeros((len(rollup['leaves']), hi - lo + 1), dtype=np.int64)
+        rollup['revenue'] = np.zeros((len(rollup['leaves']), hi - lo + 1))
+        build_vehicle_nodes(rollup)
+    else:
+        new_leaves = keys.unique().difference(rollup['leaves'])
+        if len(new_leaves) or lo < base or hi >= base + n_months:
+            pad = ((0, len(new_leaves)), (base - lo, hi - (base + n_months - 1)))
+            rollup['units'] = np.pad(rollup['units'], pad)
+            rollup['revenue'] = np.pad(rollup['revenue'], pad)
+        if len(new_leaves):
+            rollup['leaves'] = rollup['leaves'].append(new_leaves)
+            build_vehicle_nodes(rollup)
+    rollup['month_base'], rollup['n_months'] = lo, hi - lo + 1
+
+    leaf = rollup['leaves'].get_indexer(keys)
+    np.add.at(rollup['units'], (leaf, months - lo), 1)
+    np.add.at(rollup['revenue'], (leaf, months - lo), new_sales['Sale Price'].to_numpy(dtype=np.float64))
+    # Leaf totals over all months serve selections without a date range or salesperson
+    rollup['leaf_units'] = rollup['units'].sum(axis=1)
+    rollup['leaf_revenue'] = rollup['revenue'].sum(axis=1)
+
+def vehicle_tree(key):
+    """Units and revenue per hierarchy node for a filter selection, pruned to non-empty branches.
+
+    Leaf totals come from the rollup (whole months, or all time) plus rows of partial months
+    or a salesperson filter; branches are then re-summed from their leaves.
+    """
+    salesperson, car_make, car_model, car_year, start_date, end_date = key
+    rollup = vehicle_rollup
+    leaves = rollup['leaves']
+    keep = np.ones(len(leaves), dtype=bool)
+    for level, value in zip(VEHICLE_LEVELS, (car_make, car_model, car_year)):
+        if value != 'All':
+            keep &= leaves.get_level_values(level) == (int(value) if level == 'Car Year' else value)
+
+    windows = []
+    if salesperson != 'All':
+        units, revenue = np.zeros(len(leaves), dtype=np.int64), np.zeros(len(leaves))
+        windows = [(start_date, end_date)] if start_date and end_date else [None]
+    elif not (start_date and end_date):
+        units, revenue = rollup['leaf_units'].copy(), rollup['leaf_revenue'].copy()
+    else:
+        months, windows = month_windows(start_date, end_date)
+        if months is None:
+            columns = slice(0, 0)
+        else:
+            columns = slice(max(months[0] - rollup['month_base'], 0), max(months[1] - rollup['month_base'] + 1, 0))
+        units, revenue = rollup['units'][:, columns].sum(axis=1), rollup['revenue'][:, columns].sum(axis=1)
+
+    store = sales_store
+    sales_columns = store['columns']
+    filters = filter_codes(store, salesperson, car_make, car_model, car_year)
+    for window in windows:
+        rows = date_slice(store, *window) if window else slice(0, len(store['days']))
+        mask = filter_mask(sales_columns, rows.start, rows.stop, filters)
+        leaf = leaves.get_indexer(vehicle_leaf_keys(
+            store['df']['Car Make'].cat.categories.to_numpy(dtype=object)[sales_columns['Car Make'][rows][mask]],
+            store['df']['Car Model'].cat.categories.to_numpy(dtype=object)[sales_columns['Car Model'][rows][mask]],
+            sales_columns['Car Year'][rows][mask]
+        ))
+        np.add.at(units, leaf, 1)
+        np.add.at(revenue, leaf, sales_columns['Sale Price'][rows][mask].astype(np.float64))
+    units, revenue = np.where(keep, units, 0), np.where(keep, revenue, 0.0)
+
+    node_units, node_revenue = np.zeros(len(rollup['ids']), dtype=np.int64), np.zeros(len(rollup['ids']))
+    for nodes in (rollup['leaf_node'], rollup['model_node'], rollup['make_node']):
+        np.add.at(node_units, nodes, units)
+        np.add.at(node_revenue, nodes, revenue)
+    present = node_units > 0
+    return {
+        'ids': rollup['ids'][present],
+        'labels': rollup['labels'][present],
+        'parents': rollup['parents'][present],
+        'units': node_units[present],
+        'revenue': node_revenue[present],
+    }
+
+vehicle_rollup = build_vehicle_rollup(df) if not df.empty else None
+
+# Live sales ingestion: append-only batches from a POST endpoint or a drop directory
+SALES_INPUT_COLUMNS = ['Salesperson', 'Car Make', 'Car Model', 'Car Year', 'Date', 'Sale Price', 'Commission Earned']
+INGEST_DIR = os.environ.get('DASHBOARD_INGEST_DIR')
+# The POST endpoint is off unless enabled; with neither source, sessions do not poll
+INGEST_API = os.environ.get('DASHBOARD_INGEST_API', '0') == '1'
+LIVE_INGEST = bool(INGEST_DIR) or INGEST_API
+INGEST_POLL_SECONDS = float(os.environ.get('DASHBOARD_INGEST_POLL', 5))
+INGEST_ALLOW_REMOTE = os.environ.get('DASHBOARD_INGEST_ALLOW_REMOTE', '0') == '1'
+LIVE_REFRESH_SECONDS = float(os.environ.get('DASHBOARD_LIVE_REFRESH', 10))
+# App state shared by all worker processes; kept out of /tmp so other local users cannot plant files
+DATA_DIR = os.environ.get('DASHBOARD_DATA_DIR', os.path.join(os.path.expanduser('~'), '.automotive_dashboard'))
+INGEST_LOG_DB = os.path.join(DATA_DIR, "sales_batches.db")
+# Result cache entries keyed by filter selections rather than by payload contents
+SELECTION_KEYED_TABS = {'tab-inventory'}
+
+ingest_lock = threading.Lock()
+apply_lock = threading.Lock()
+ingested_files = set()
+ingest_stop = threading.Event()
+live_totals = OrderedDict()
+live_totals_lock = threading.Lock()
+
+def prepare_sales_batch(raw):
+    """Validated, date-sorted and compacted sales rows with the store's columns and categories."""
+    missing = [col for col in SALES_INPUT_COLUMNS if col not in raw]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    batch = raw[SALES_INPUT_COLUMNS].copy()
+    batch['Date'] = pd.to_datetime(batch['Date'], errors='coerce')
+    for col in ['Car Year', 'Sale Price', 'Commission Earned']:
+        batch[col] = pd.to_numeric(batch[col], errors='coerce')
+    batch = batch.dropna().sort_values('Date', kind='stable').reset_index(drop=True)
+    batch['Year'] = batch['Date'].dt.year
+    batch['Quarter'] = batch['Date'].dt.to_period('Q').astype(str)
+    batch['Month'] = batch['Date'].dt.to_period('M').astype(str)
+    batch = compact_frame(batch, DATASET_SCHEMAS['sales'])
+    columns = sales_store['df'].columns
+    return batch[[col for col in columns if col in batch]] if len(columns) else batch
+
+def extend_categories(store, batch):
+    """Add the batch's new labels to the end of the store's categories so existing codes stay valid."""
+    extended = {}
+    for col in store.columns:
+        if isinstance(store[col].dtype, pd.CategoricalDtype):
+            new_labels = pd.Index(batch[col].unique()).difference(store[col].cat.categories)
+            extended[col] = store[col].cat.add_categories(new_labels) if len(new_labels) else store[col]
+            batch[col] = pd.Categorical(batch[col], categories=extended[col].cat.categories)
+    return store.assign(**extended), batch
+
+def extend_sales_columns(columns, batch_columns):
+    """Aggregation columns with a later batch appended; month bounds are widened, not recomputed."""
+    extended = {col: np.concatenate([columns[col], batch_columns[col]]) for col in AGG_COLUMNS}
+    months = extended['Month']
+    extended['month_base'] = min(columns['month_base'], batch_columns['month_base'])
+    extended['n_months'] = int(months.max()) - extended['month_base'] + 1
+    return extended
+
+def selection_touched(store, key, batch_columns, batch_days):
+    """Whether any batch row falls inside a normalized filter selection."""
+    salesperson, car_make, car_model, car_year, start_date, end_date = key
+    mask = filter_mask(batch_columns, 0, len(batch_days), filter_codes(store, salesperson, car_make, car_model, car_year))
+    if start_date and end_date:
+        mask &= (batch_days >= to_epoch_day(start_date)) & (batch_days <= to_epoch_day(end_date))
+    return bool(mask.any())
+
+def invalidate_for_batch(store, batch_columns, batch_days, changed_makes):
+    """Evict cached results whose filter selection the batch touches.
+
+    Entries keyed by a filtered-data signature describe that payload and stay valid.
+    """
+    touched = {}
+    def stale(*keys):
+        for key in keys:
+            if key not in touched:
+                touched[key] = selection_touched(store, key, batch_columns, batch_days)
+        return any(touched[key] for key in keys)
+    with result_cache_lock:
+        keys = list(result_cache)
+    evict = []
+    for key in keys:
+        if key[0] == 'filters':
+            affected = stale(key[1])
+        elif key[0] == 'compare':
+            affected = stale(key[1], key[2])
+        elif key[0] in ('model', 'vehicle'):
+            affected = stale(key[1])
+        elif key[0] == 'tab' and key[2] == 'compare':
+            affected = stale(key[4], key[5])
+        else:
+            affected = key[0] == 'tab' and key[1] in SELECTION_KEYED_TABS and bool(changed_makes)
+        if affected:
+            evict.append(key)
+    with result_cache_lock:
+        for key in evict:
+            drop_cache_entry(key)
+    return len(evict)
+
+def ingest_sales(raw, version=None):
+    """Append a batch of sales rows and bring indexes, aggregates and caches up to date.
+
+    Batches dated at or after the last stored sale are appended in O(batch) for the
+    index, aggregates and cache checks; earlier rows fall back to a merge-and-resort.
+    `version` is the batch's ingest log id; without one the local version is bumped.
+    """
+    global sales_store, cached_data
+    received = len(raw)
+    with ingest_lock:
+        current = sales_store
+        batch = prepare_sales_batch(raw)
+        if batch.empty:
+            return {'accepted': 0, 'rejected': received, 'version': current['version']}
+        sales_df = current['df']
+        sales_df, batch = extend_categories(sales_df, batch) if not sales_df.empty else (sales_df, batch)
+        batch_days = build_date_index(batch)
+        batch_columns = build_sales_columns(batch)
+        combined = pd.concat([sales_df, batch], ignore_index=True)
+        days, epoch = current['days'], current['epoch']
+        if len(days) and batch_days[0] >= days[-1]:
+            new_columns = extend_sales_columns(current['columns'], batch_columns)
+            new_days = np.concatenate([days, batch_days])
+        else:
+            combined = combined.sort_values('Date', kind='stable').reset_index(drop=True)
+            new_columns = build_sales_columns(combined)
+            new_days = build_date_index(combined)
+            epoch += 1
+        store = {
+            'df': combined,
+            'days': new_days,
+            'columns': new_columns,
+            'epoch': epoch,
+            'version': version if version is not None else current['version'] + 1,
+        }
+        # Shared copies are made before the swap and installed with it, so a pool task
+        # never pairs the new row bounds with the previous generation's blocks
+        shared = share_columns(new_columns) if shared_store['current'] is not None else None
+        with shared_store_lock:
+            if shared is None and shared_store['current'] is not None:
+                shared = share_columns(new_columns)
+            if shared is not None:
+                install_shared_columns(shared)
+            # The new version is published with the data, before the eviction below, so a
+            # result computed from the previous store is either evicted or never cached
+            sales_store = store
+        cached_data = (combined,) + cached_data[1:]
+
+        changed_makes = update_reorder_state(reorder_state, batch) if reorder_state is not None else []
+        if model_sketches is not None:
+            update_model_sketches(model_sketches, batch)
+        if vehicle_rollup is not None:
+            update_vehicle_rollup(vehicle_rollup, batch)
+        evicted = invalidate_for_batch(store, batch_columns, batch_days, changed_makes)
+        version = store['version']
+    warm_wakeup.set()
+    logging.info(
+        f"Ingested {len(batch)} sales rows (rejected {received - len(batch)}), "
+        f"dataset version {version}, evicted {evicted} cache entries"
+    )
+    return {'accepted': len(batch), 'rejected': received - len(batch), 'version': version}
+
+def sales_totals(key):
+    """Count and sums for a normalized filter selection, folding in only rows added since last time."""
+    salesperson, car_make, car_model, car_year, start_date, end_date = key
+    store = sales_store
+    rows = date_slice(store, start_date, end_date) if start_date and end_date else slice(0, len(store['days']))
+    filters = filter_codes(store, salesperson, car_make, car_model, car_year)
+    with live_totals_lock:
+        entry = live_totals.get(key)
+    if entry is not None and entry['epoch'] == store['epoch']:
+        totals = dict(entry['totals'])
+        lo = max(entry['rows'], rows.start)
+        if rows.stop > lo:
+            delta = aggregate_partition(store['columns'], lo, rows.stop, filters)
+            for name in totals:
+                totals[name] += delta[name]
+    else:
+        totals = aggregate_sales(store, rows, filters)
+    return remember_totals(key, totals, len(store['days']), store['epoch'])
+
+def remember_totals(key, totals, rows, epoch):
+    totals = {name: totals[name] for name in ('count', 'sale_sum', 'commission_sum')}
+    with live_totals_lock:
+        live_totals[key] = {'totals': totals, 'rows': rows, 'epoch': epoch}
+        live_totals.move_to_end(key)
+        while len(live_totals) > RESULT_CACHE_SIZE:
+            live_totals.popitem(last=False)
+    return totals
+
+def metric_cards(totals):
+    """Metric card texts for a totals dict."""
+    return (
+        f"Total Sales: ${totals['sale_sum']:,.0f}",
+        f"Total Commission: ${totals['commission_sum']:,.0f}",
+        f"Avg Sale Price: ${totals['sale_sum'] / totals['count']:,.0f}" if totals['count'] else "Avg Sale Price: $0",
+        f"Transactions: {totals['count']:,}"
+    )
+
+def read_sales_file(path):
+    if path.endswith('.json'):
+        return pd.read_json(path, orient='records')
+    return pd.read_csv(path)
+
+@contextmanager
+def state_connection(path, schema):
+    """Connection to one of the app's SQLite files for one transaction; `schema` creates its table."""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(schema)
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+# Every worker process applies the same logged batches in id order
+INGEST_LOG_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sales_batches ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " source TEXT UNIQUE,"
+    " records TEXT NOT NULL,"
+    " received_at REAL NOT NULL)"
+)
+
+def log_sales_batch(raw, source=None):
+    """Append raw sales rows to the shared ingest log; returns the batch id, or None if `source` is logged already."""
+    records = raw.to_json(orient='records', date_format='iso')
+    with state_connection(INGEST_LOG_DB, INGEST_LOG_SCHEMA) as connection:
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO sales_batches (source, records, received_at) VALUES (?, ?, ?)",
+            (source, records, time.time())
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+def apply_logged_sales():
+    """Ingest the log batches this process has not applied yet and return the dataset version."""
+    global sales_store
+    with apply_lock:
+        with state_connection(INGEST_LOG_DB, INGEST_LOG_SCHEMA) as connection:
+            pending = connection.execute(
+                "SELECT id, records FROM sales_batches WHERE id > ? ORDER BY id", (sales_store['version'],)
+            ).fetchall()
+        for batch_id, records in pending:
+            try:
+                ingest_sales(pd.DataFrame.from_records(json.loads(records)), batch_id)
+            except Exception as e:
+                logging.error(f"Error ingesting logged batch {batch_id}: {str(e)}")
+            with ingest_lock:
+                # Rejected and empty batches still advance it, so versions match across workers
+                if sales_store['version'] < batch_id:
+                    sales_store = dict(sales_store, version=batch_id)
+    return sales_store['version']
+
+def ingest_directory():
+    """Log drop-directory files not seen yet, in name order.
+
+    Files are left in place and logged under their name, so a file is logged once however
+    many workers scan the directory. Writers should create files under a temporary name
+    and rename them into place.
+    """
+    try:
+        names = sorted(
+            name for name in os.listdir(INGEST_DIR)
+            if name.endswith(('.csv', '.json')) and name not in ingested_files
+        )
+    except OSError as e:
+        logging.error(f"Error listing ingest directory: {str(e)}")
+        return
+    for name in names:
+        try:
+            log_sales_batch(read_sales_file(os.path.join(INGEST_DIR, name)), source=f"file:{name}")
+        except Exception as e:
+            logging.error(f"Error ingesting {name}: {str(e)}")
+        ingested_files.add(name)
+
+def ingest_loop():
+    while not ingest_stop.is_set():
+        if INGEST_DIR:
+            ingest_directory()
+        try:
+            apply_logged_sales()
+        except sqlite3.Error as e:
+            logging.error(f"Error reading ingest log: {str(e)}")
+        ingest_stop.wait(INGEST_POLL_SECONDS)
+
+@server.route('/api/sales', methods=['POST'])
+def ingest_sales_endpoint():
+    """Append JSON sales records (one object or a list) posted from this host."""
+    if not INGEST_API:
+        flask.abort(404)
+    if not INGEST_ALLOW_REMOTE and flask.request.remote_addr not in ('127.0.0.1', '::1'):
+        return flask.jsonify(error="Ingestion is only accepted from localhost"), 403
+    records = flask.request.get_json(silent=True)
+    if isinstance(records, dict):
+        records = [records]
+    if not isinstance(records, list):
+        return flask.jsonify(error="Expected a JSON object or list of sales records"), 400
+    try:
+        raw = pd.DataFrame.from_records(records)
+        accepted = len(prepare_sales_batch(raw))
+        # Logged first so every worker applies it; this one applies it before replying
+        version = log_sales_batch(raw)
+        apply_logged_sales()
+        return flask.jsonify(accepted=accepted, rejected=len(raw) - accepted, version=version)
+    except ValueError as e:
+        return flask.jsonify(error=str(e)), 400
+    except Exception as e:
+        logging.error(f"Error ingesting posted sales: {str(e)}")
+        return flask.jsonify(error=str(e)), 500
+
+# Saved views: named filters, tab and metric in SQLite, with their results materialized alongside
+VIEWS_DB = os.environ.get('DASHBOARD_VIEWS_DB', os.path.join(DATA_DIR, "saved_views.db"))
+# Bump when the materialized objects change shape, so older rows are recomputed
+VIEWS_FORMAT = 2
+VIEWS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS saved_views ("
+    " name TEXT PRIMARY KEY,"
+    " filters TEXT NOT NULL,"
+    " tab TEXT NOT NULL,"
+    " metric TEXT NOT NULL,"
+    " created_at REAL NOT NULL,"
+    " dataset_tag TEXT,"
+    " format INTEGER,"
+    " materialized BLOB,"
+    " materialized_at REAL)"
+)
+
+def dataset_tag():
+    """The data source and ingest log version, the same in every worker that has caught up."""
+    return f"{DATA_SOURCE}:{sales_store['version']}"
+
+def views_connection():
+    return state_connection(VIEWS_DB, VIEWS_SCHEMA)
+
+def to_view_json(value):
+    """JSON-ready form of a cached value; tuples, non-string keys, arrays, frames and indexes are tagged.
+
+    Components and figures are stored as their plotly JSON, which callbacks can return as is.
+    """
+    if isinstance(value, tuple):
+        return {'__tuple__': [to_view_json(item) for item in value]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: to_view_json(item) for key, item in value.items()}
+        return {'__items__': [[to_view_json(key), to_view_json(item)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [to_view_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        data = value.astype(np.int64) if value.dtype.kind in 'mM' else value
+        return {'__array__': to_view_json(data.ravel().tolist()), 'dtype': value.dtype.str, 'shape': list(value.shape)}
+    if isinstance(value, pd.DataFrame):
+        return {'__frame__': [[col, to_view_json(value[col].to_numpy())] for col in value.columns]}
+    if isinstance(value, pd.Index):
+        return {'__index__': to_view_json(value.to_numpy())}
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'to_plotly_json'):
+        return to_view_json(value.to_plotly_json())
+    return value
+
+def from_view_json(value):
+    if isinstance(value, list):
+        return [from_view_json(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '__tuple__' in value:
+        return tuple(from_view_json(item) for item in value['__tuple__'])
+    if '__items__' in value:
+        return {from_view_json(key): from_view_json(item) for key, item in value['__items__']}
+    if '__array__' in value:
+        dtype = np.dtype(value['dtype'])
+        data = from_view_json(value['__array__'])
+        array = np.array(data, dtype=np.int64).astype(dtype) if dtype.kind in 'mM' else np.array(data, dtype=dtype)
+        return array.reshape(value['shape'])
+    if '__frame__' in value:
+        return pd.DataFrame({col: from_view_json(item) for col, item in value['__frame__']})
+    if '__index__' in value:
+        return pd.Index(from_view_json(value['__index__']))
+    return {key: from_view_json(item) for key, item in value.items()}
+
+def list_saved_views():
+    try:
+        with views_connection() as connection:
+            return [name for (name,) in connection.execute("SELECT name FROM saved_views ORDER BY name")]
+    except sqlite3.Error as e:
+        logging.error(f"Error listing saved views: {str(e)}")
+        return []
+
+def view_cache_keys(key, tab, metric, signature):
+    """Result cache entries a view reads when it opens: its filters, tab content and default graphs."""
+    content_signature = 'static' if tab in FILTER_INDEPENDENT_TABS else signature
+    return [
+        ('filters', key),
+        ('kpi-monthly', signature),
+        ('tab', tab, content_signature, metric),
+        ('trends', signature, metric, None),
+        ('model', key, metric, 'Car Model'),
+        ('vehicle', key),
+    ]
+
+def materialize_view(key, tab, metric):
+    """Compute (or reuse) a view's results and return them as compressed JSON cache entries."""
+    signature = warm_combination(key, tab, metric)
+    entries = [(cache_key, cache_get(cache_key)) for cache_key in view_cache_keys(key, tab, metric, signature)]
+    document = json.dumps([to_view_json(entry) for entry in entries if entry[1] is not None])
+    return zlib.compress(document.encode('utf-8'))
+
+def save_view(name, key, tab, metric):
+    tag = dataset_tag()
+    blob = materialize_view(key, tab, metric)
+    with views_connection() as connection:
+        connection.execute(
+            "INSERT INTO saved_views"
+            " (name, filters, tab, metric, created_at, dataset_tag, format, materialized, materialized_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET filters = excluded.filters, tab = excluded.tab,"
+            " metric = excluded.metric, dataset_tag = excluded.dataset_tag, format = excluded.format,"
+            " materialized = excluded.materialized, materialized_at = excluded.materialized_at",
+            (name, json.dumps(list(key)), tab, metric, time.time(), tag, VIEWS_FORMAT, blob, time.time())
+        )
+    logging.info(f"Saved view '{name}' ({len(blob):,} bytes materialized)")
+
+def delete_view(name):
+    with views_connection() as connection:
+        connection.execute("DELETE FROM saved_views WHERE name = ?", (name,))
+
+def tag_version(tag):
+    source, _, version = (tag or '').rpartition(':')
+    return (source, int(version)) if version.isdigit() else (None, -1)
+
+def open_view(name):
+    """A saved view's selection, with its materialized results loaded into the result cache.
+
+    Results tagged with another data version or format are recomputed and written back,
+    unless they come from a newer version than this worker has applied so far.
+    """
+    with views_connection() as connection:
+        row = connection.execute(
+            "SELECT filters, tab, metric, dataset_tag, format, materialized FROM saved_views WHERE name = ?",
+            (name,)
+        ).fetchone()
+    if row is None:
+        return None
+    filters, tab, metric, tag, view_format, blob = row
+    key = tuple(json.loads(filters))
+    current = dataset_tag()
+    entries = None
+    if tag == current and view_format == VIEWS_FORMAT and blob is not None:
+        try:
+            entries = [from_view_json(entry) for entry in json.loads(zlib.decompress(blob))]
+        except (zlib.error, ValueError, TypeError) as e:
+            logging.warning(f"Discarding unreadable materialized view '{name}': {str(e)}")
+    if entries is None:
+        blob = materialize_view(key, tab, metric)
+        source, version = tag_version(tag)
+        if source != DATA_SOURCE or version <= sales_store['version']:
+            with views_connection() as connection:
+                connection.execute(
+                    "UPDATE saved_views SET dataset_tag = ?, format = ?, materialized = ?, materialized_at = ? WHERE name = ?",
+                    (current, VIEWS_FORMAT, blob, time.time(), name)
+                )
+            logging.info(f"Refreshed materialized view '{name}'")
+    else:
+        for cache_key, value in entries:
+            cache_put(cache_key, value)
+        if dataset_tag() != current:
+            # A batch ingested while restoring may have been checked against the cache already
+            with result_cache_lock:
+                for cache_key, _ in entries:
+                    drop_cache_entry(cache_key)
+    return {'filters': key, 'tab': tab, 'metric': metric}
+
 # Custom CSS
 custom_css = """
 body {
@@ -218,6 +1770,11 @@ with open("assets/custom.css", "w") as f:
     f.write(custom_css)
 
 # Layout
+def filter_options(column):
+    """'All' and the sorted values of a sales column as dropdown options."""
+    values = sorted(sales_store['df'][column].dropna().unique())
+    return [{'label': 'All', 'value': 'All'}] + [{'label': str(x), 'value': str(x)} for x in values]
+
 app.layout = dbc.Container([
     # Welcome Modal
     dbc.Modal([
@@ -314,7 +1871,7 @@ app.layout = dbc.Container([
                             ),
                             dcc.Dropdown(
                                 id='salespeople-dropdown',
-                                options=[{'label': 'All', 'value': 'All'}] + [{'label': x, 'value': x} for x in sorted(df['Salesperson'].dropna().unique())],
+                                options=filter_options('Salesperson'),
                                 value='All',
                                 className="mb-2",
                                 clearable=False,
@@ -335,7 +1892,7 @@ app.layout = dbc.Container([
                             ),
                             dcc.Dropdown(
                                 id='car-makes-dropdown',
-                                options=[{'label': 'All', 'value': 'All'}] + [{'label': x, 'value': x} for x in sorted(df['Car Make'].dropna().unique())],
+                                options=filter_options('Car Make'),
                                 value='All',
                                 className="mb-2",
                                 clearable=False,
@@ -356,7 +1913,7 @@ app.layout = dbc.Container([
                             ),
                             dcc.Dropdown(
                                 id='car-years-dropdown',
-                                options=[{'label': 'All', 'value': 'All'}] + [{'label': str(x), 'value': str(x)} for x in sorted(df['Car Year'].dropna().astype(str).unique())],
+                                options=filter_options('Car Year'),
                                 value='All',
                                 className="mb-2",
                                 clearable=False,
@@ -421,10 +1978,10 @@ app.layout = dbc.Container([
                             ),
                             dcc.DatePickerRange(
                                 id='date-range',
-                                min_date_allowed=df['Date'].min(),
-                                max_date_allowed=df['Date'].max(),
-                                start_date=df['Date'].min(),
-                                end_date=df['Date'].max(),
+                                min_date_allowed=date_bounds()[0],
+                                max_date_allowed=date_bounds()[1],
+                                start_date=date_bounds()[0],
+                                end_date=date_bounds()[1],
                                 display_format='YYYY-MM-DD',
                                 className="mb-2",
                                 aria_describedby="date-range-tooltip"
@@ -455,13 +2012,111 @@ app.layout = dbc.Container([
                                 className="mb-2"
                             )
                         ], width={"size": 3, "xs": 12}),
-                    ])
+                    ]),
+                    # Comparison mode: the filters above are set A, these are set B
+                    dbc.Row([
+                        dbc.Col([
+                            dcc.Checklist(
+                                id='compare-mode',
+                                options=[{'label': " Compare with a second filter set (B)", 'value': 'on'}],
+                                value=[],
+                                className="text-white mb-2",
+                                inputStyle={"marginRight": "5px"}
+                            ),
+                            dbc.Tooltip(
+                                "Show the filters above (A) against set B in the KPI tab and metric cards",
+                                target="compare-mode",
+                                placement="top"
+                            )
+                        ], width=12)
+                    ]),
+                    dbc.Collapse(
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label(label, htmlFor=dropdown_id, className="text-white", style={"fontWeight": "500"}),
+                                dcc.Dropdown(
+                                    id=dropdown_id,
+                                    options=options,
+                                    value='All',
+                                    className="mb-2",
+                                    clearable=False
+                                )
+                            ], width={"size": 2, "xs": 12})
+                            for label, dropdown_id, options in [
+                                ("B: Salesperson", 'b-salespeople-dropdown', filter_options('Salesperson')),
+                                ("B: Car Make", 'b-car-makes-dropdown', filter_options('Car Make')),
+                                ("B: Car Year", 'b-car-years-dropdown', filter_options('Car Year')),
+                                ("B: Car Model", 'b-car-models-dropdown', [{'label': 'All', 'value': 'All'}])
+                            ]
+                        ] + [
+                            dbc.Col([
+                                html.Label("B: Date Range", htmlFor="b-date-range", className="text-white", style={"fontWeight": "500"}),
+                                dcc.DatePickerRange(
+                                    id='b-date-range',
+                                    min_date_allowed=date_bounds()[0],
+                                    max_date_allowed=date_bounds()[1],
+                                    start_date=date_bounds()[0],
+                                    end_date=date_bounds()[1],
+                                    display_format='YYYY-MM-DD',
+                                    className="mb-2"
+                                )
+                            ], width={"size": 4, "xs": 12})
+                        ]),
+                        id="compare-collapse",
+                        is_open=False
+                    )
                 ]),
                 id="collapse-filters",
                 is_open=True
             )
         ], className="mb-4 card"),
 
+        # Saved Views
+        dbc.Card([
+            dbc.CardHeader(
+                html.Div([
+                    html.I(className="fas fa-bookmark mr-2"),
+                    "Saved Views"
+                ], style={"fontWeight": "600"})
+            ),
+            dbc.CardBody([
+                dbc.Row([
+                    dbc.Col([
+                        dbc.Input(id="view-name-input", placeholder="Name for the applied filters, tab and metric", className="mb-2")
+                    ], width={"size": 4, "xs": 12}),
+                    dbc.Col([
+                        dbc.Button(
+                            [html.I(className="fas fa-save mr-1"), "Save View"],
+                            id="save-view",
+                            color="primary",
+                            className="mb-2"
+                        )
+                    ], width={"size": 2, "xs": 12}),
+                    dbc.Col([
+                        dcc.Dropdown(
+                            id='saved-views-dropdown',
+                            placeholder="Select a saved view",
+                            className="mb-2"
+                        )
+                    ], width={"size": 3, "xs": 12}),
+                    dbc.Col([
+                        dbc.Button(
+                            [html.I(className="fas fa-folder-open mr-1"), "Open"],
+                            id="open-view",
+                            color="secondary",
+                            className="mr-2 mb-2"
+                        ),
+                        dbc.Button(
+                            [html.I(className="fas fa-trash mr-1"), "Delete"],
+                            id="delete-view",
+                            color="danger",
+                            className="mb-2"
+                        )
+                    ], width={"size": 3, "xs": 12})
+                ])
+            ])
+        ], className="mb-4 card"),
+
         # Metrics
         dbc.Card([
             dbc.CardHeader(
@@ -581,6 +2236,10 @@ app.layout = dbc.Container([
 
         # Stores
         dcc.Store(id='filtered-data'),
+        dcc.Store(id='comparison-data'),
+        dcc.Store(id='applied-filters'),
+        dcc.Store(id='seen-version'),
+        dcc.Interval(id='live-refresh', interval=LIVE_REFRESH_SECONDS * 1000, disabled=not LIVE_INGEST),
         dcc.Store(id='theme-state', data='dark'),
         dcc.Store(id='chart-state', data={}),
         dcc.Store(id='modal-state', data={'show': True})
@@ -596,7 +2255,8 @@ def update_car_models(car_make):
     try:
         options = [{'label': 'All', 'value': 'All'}]
         if car_make != 'All':
-            models = sorted(df[df['Car Make'] == car_make]['Car Model'].dropna().unique())
+            sales_df = sales_store['df']
+            models = sorted(sales_df[sales_df['Car Make'] == car_make]['Car Model'].dropna().unique())
             options.extend([{'label': x, 'value': x} for x in models])
         logging.info(f"Car models updated for {car_make}")
         return options
@@ -604,6 +2264,88 @@ def update_car_models(car_make):
         logging.error(f"Error updating car models: {str(e)}")
         return [{'label': 'All', 'value': 'All'}]
 
+@app.callback(
+    Output('b-car-models-dropdown', 'options'),
+    Input('b-car-makes-dropdown', 'value')
+)
+def update_compare_car_models(car_make):
+    return update_car_models(car_make)
+
+@app.callback(
+    Output('compare-collapse', 'is_open'),
+    Input('compare-mode', 'value')
+)
+def toggle_compare(compare_mode):
+    return bool(compare_mode)
+
+def filter_key(salesperson, car_make, car_model, car_year, start_date, end_date):
+    """Normalized filter selection; dates are reduced to YYYY-MM-DD."""
+    def day(value):
+        return str(np.datetime64(int(to_epoch_day(value)), 'D')) if value else None
+    return (salesperson, car_make, car_model, car_year, day(start_date), day(end_date))
+
+def filter_sales(salesperson, car_make, car_model, car_year, start_date, end_date):
+    """Filtered sales payload and metric card texts, cached per filter selection."""
+    key = filter_key(salesperson, car_make, car_model, car_year, start_date, end_date)
+    return cached_compute(
+        ('filters', key),
+        lambda: compute_filtered_sales(key, salesperson, car_make, car_model, car_year, start_date, end_date)
+    )
+
+def compute_filtered_sales(key, salesperson, car_make, car_model, car_year, start_date, end_date):
+    store = sales_store
+    # Narrow to the date window first, then scan only that slice for the other filters
+    rows = date_slice(store, start_date, end_date) if start_date and end_date else slice(0, len(store['days']))
+    filters = filter_codes(store, salesperson, car_make, car_model, car_year)
+    mask = filter_mask(store['columns'], rows.start, rows.stop, filters)
+    filtered_df = store['df'].iloc[rows]
+    if not mask.all():
+        filtered_df = filtered_df[mask]
+    payload = filtered_df.to_json(date_format='iso', orient='split')
+
+    totals = aggregate_sales(store, rows, filters, mask)
+    signature = filter_signature(payload)
+    # The KPI tab reads its monthly series from here instead of re-grouping the payload
+    cache_put(('kpi-monthly', signature), totals['monthly'])
+    remember_signature(signature, key)
+    # Live card refreshes start from these totals and add only rows ingested later
+    remember_totals(key, totals, len(store['days']), store['epoch'])
+    return (payload, *metric_cards(totals))
+
+def comparison_side(store, key):
+    """(rows, filters, start month) in the store for a normalized filter selection."""
+    salesperson, car_make, car_model, car_year, start_date, end_date = key
+    rows = date_slice(store, start_date, end_date) if start_date and end_date else slice(0, len(store['days']))
+    start_month = pd.Period(start_date or date_bounds(store)[0], freq='M').ordinal
+    return rows, filter_codes(store, salesperson, car_make, car_model, car_year), start_month
+
+def compare_store(key_a, key_b):
+    """A/B comparison of two normalized filter selections against one snapshot of the store."""
+    store = sales_store
+    return compare_sales(store, comparison_side(store, key_a), comparison_side(store, key_b))
+
+def compare_filters(key_a, key_b):
+    """A/B comparison of two normalized filter selections, cached per pair."""
+    return cached_compute(('compare', key_a, key_b), lambda: compare_store(key_a, key_b))
+
+def comparison_cards(result):
+    """Metric card texts showing A, B and the change from A to B."""
+    def card(title, value_a, value_b, fmt):
+        delta = f" (Δ {(value_b - value_a) / value_a:+.1%})" if value_a else ""
+        return f"{title}: A {fmt(value_a)} | B {fmt(value_b)}{delta}"
+    money = lambda value: f"${value:,.0f}"
+    average = lambda totals: totals['sale_sum'] / totals['count'] if totals['count'] else 0
+    a, b = result['A'], result['B']
+    overlap = f", {result['both']['count']:,} in both" if result['both']['count'] else ""
+    return (
+        card("Total Sales", a['sale_sum'], b['sale_sum'], money),
+        card("Total Commission", a['commission_sum'], b['commission_sum'], money),
+        card("Avg Sale Price", average(a), average(b), money),
+        card("Transactions", a['count'], b['count'], lambda value: f"{value:,}") + overlap
+    )
+
+DEFAULT_FILTERS = ('All', 'All', 'All', 'All', None, None)
+
 @app.callback(
     [
         Output('filtered-data', 'data'),
@@ -612,7 +2354,9 @@ def update_car_models(car_make):
         Output('avg-price', 'children'),
         Output('trans-count', 'children'),
         Output('notification-toast', 'is_open'),
-        Output('notification-toast', 'children')
+        Output('notification-toast', 'children'),
+        Output('comparison-data', 'data'),
+        Output('applied-filters', 'data')
     ],
     [
         Input('apply-filters', 'n_clicks'),
@@ -622,61 +2366,187 @@ def update_car_models(car_make):
         State('car-models-dropdown', 'value'),
         State('car-years-dropdown', 'value'),
         State('date-range', 'start_date'),
-        State('date-range', 'end_date')
+        State('date-range', 'end_date'),
+        State('compare-mode', 'value'),
+        State('b-salespeople-dropdown', 'value'),
+        State('b-car-makes-dropdown', 'value'),
+        State('b-car-models-dropdown', 'value'),
+        State('b-car-years-dropdown', 'value'),
+        State('b-date-range', 'start_date'),
+        State('b-date-range', 'end_date')
     ]
 )
-def apply_filters(apply_clicks, clear_clicks, salesperson, car_make, car_model, car_year, start_date, end_date):
+def apply_filters(apply_clicks, clear_clicks, salesperson, car_make, car_model, car_year, start_date, end_date,
+                  compare_mode, b_salesperson, b_car_make, b_car_model, b_car_year, b_start_date, b_end_date):
     try:
         ctx = dash.callback_context
         triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
         
         if triggered_id == 'clear-filters':
             return (
-                df.to_json(date_format='iso', orient='split'),
+                filter_sales(*DEFAULT_FILTERS)[0],
                 "Total Sales: $0",
                 "Total Commission: $0",
                 "Avg Sale Price: $0",
                 "Transactions: 0",
                 True,
-                "Filters cleared successfully!"
+                "Filters cleared successfully!",
+                None,
+                None
             )
         
         if apply_clicks is None and clear_clicks is None:
             return (
-                df.to_json(date_format='iso', orient='split'),
+                filter_sales(*DEFAULT_FILTERS)[0],
                 "Total Sales: $0",
                 "Total Commission: $0",
                 "Avg Sale Price: $0",
                 "Transactions: 0",
                 False,
-                ""
+                "",
+                None,
+                None
             )
         
-        filtered_df = df.copy()
-        if salesperson != 'All':
-            filtered_df = filtered_df[filtered_df['Salesperson'] == salesperson]
-        if car_make != 'All':
-            filtered_df = filtered_df[filtered_df['Car Make'] == car_make]
-        if car_model != 'All':
-            filtered_df = filtered_df[filtered_df['Car Model'] == car_model]
-        if car_year != 'All':
-            filtered_df = filtered_df[filtered_df['Car Year'].astype(str) == car_year]
-        if start_date and end_date:
-            filtered_df = filtered_df[
-                (filtered_df['Date'] >= pd.to_datetime(start_date)) & 
-                (filtered_df['Date'] <= pd.to_datetime(end_date))
-            ]
-        
-        total_sales = f"Total Sales: ${filtered_df['Sale Price'].sum():,.0f}"
-        total_comm = f"Total Commission: ${filtered_df['Commission Earned'].sum():,.0f}"
-        avg_price = f"Avg Sale Price: ${filtered_df['Sale Price'].mean():,.0f}" if not filtered_df.empty else "Avg Sale Price: $0"
-        trans_count = f"Transactions: {filtered_df.shape[0]:,}"
-        
+        note_activity()
+        payload, total_sales, total_comm, avg_price, trans_count = filter_sales(
+            salesperson, car_make, car_model, car_year, start_date, end_date
+        )
+        key_a = filter_key(salesperson, car_make, car_model, car_year, start_date, end_date)
+        if compare_mode:
+            # Other tabs keep showing set A; the KPI tab and cards show A against B
+            key_b = filter_key(b_salesperson, b_car_make, b_car_model, b_car_year, b_start_date, b_end_date)
+            cards = comparison_cards(compare_filters(key_a, key_b))
+            logging.info("Comparison applied successfully")
+            return (payload, *cards, True, "Comparison applied successfully!", {'a': list(key_a), 'b': list(key_b)}, list(key_a))
         logging.info("Filters applied successfully")
-        return filtered_df.to_json(date_format='iso', orient='split'), total_sales, total_comm, avg_price, trans_count, True, "Filters applied successfully!"
+        return payload, total_sales, total_comm, avg_price, trans_count, True, "Filters applied successfully!", None, list(key_a)
     except Exception as e:
         logging.error(f"Error applying filters: {str(e)}")
-        return df.to_json(date_format='iso', orient='split'), "Total Sales: $0", "Total Commission: $0", "Avg Sale Price: $0", "Transactions: 0", True, f"Error: {str(e)}"
+        return sales_store['df'].to_json(date_format='iso', orient='split'), "Total Sales: $0", "Total Commission: $0", "Avg Sale Price: $0", "Transactions: 0", True, f"Error: {str(e)}", None, None
+
+def follow_date_bounds(start_date, end_date, bounds):
+    """A date range moved onto the current data bounds where it sat on the previous ones.
+
+    Ranges picked up to the last sale (the picker default) then keep including later sales.
+    """
+    first, last = date_bounds()
+    if not (start_date and end_date) or first is None or None in bounds:
+        return start_date, end_date
+    if to_epoch_day(start_date) <= to_epoch_day(bounds[0]):
+        start_date = first.strftime('%Y-%m-%d')
+    if to_epoch_day(end_date) >= to_epoch_day(bounds[1]):
+        end_date = last.strftime('%Y-%m-%d')
+    return start_date, end_date
+
+def follow_filter_bounds(key, bounds):
+    key = tuple(key)
+    return key[:4] + follow_date_bounds(key[4], key[5], bounds)
+
+@app.callback(
+    [
+        Output('total-sales', 'children', allow_duplicate=True),
+        Output('total-commission', 'children', allow_duplicate=True),
+        Output('avg-price', 'children', allow_duplicate=True),
+        Output('trans-count', 'children', allow_duplicate=True),
+        Output('seen-version', 'data'),
+        Output('applied-filters', 'data', allow_duplicate=True),
+        Output('comparison-data', 'data', allow_duplicate=True)
+    ],
+    Input('live-refresh', 'n_intervals'),
+    [
+        State('seen-version', 'data'),
+        State('applied-filters', 'data'),
+        State('comparison-data', 'data'),
+        State('date-range', 'min_date_allowed'),
+        State('date-range', 'max_date_allowed'),
+        State('b-date-range', 'min_date_allowed'),
+        State('b-date-range', 'max_date_allowed')
+    ],
+    prevent_initial_call=True
+)
+def refresh_metric_cards(n_intervals, seen_version, applied, comparison, min_date, max_date, b_min_date, b_max_date):
+    """Push metric cards for the applied filters once new sales have been ingested.
+
+    Versions only grow, so a session ahead of this worker waits for it to catch up.
+    """
+    version = sales_store['version']
+    if seen_version is not None and seen_version >= version:
+        return dash.no_update
+    try:
+        if comparison:
+            key_a = follow_filter_bounds(comparison['a'], (min_date, max_date))
+            key_b = follow_filter_bounds(comparison['b'], (b_min_date, b_max_date))
+            cards = comparison_cards(compare_filters(key_a, key_b))
+            moved = [key_a, key_b] != [tuple(comparison['a']), tuple(comparison['b'])]
+            return (
+                *cards, version,
+                list(key_a) if moved else dash.no_update,
+                {'a': list(key_a), 'b': list(key_b)} if moved else dash.no_update
+            )
+        if applied:
+            key = follow_filter_bounds(applied, (min_date, max_date))
+            cards = metric_cards(sales_totals(key))
+            logging.info(f"Metric cards refreshed to dataset version {version}")
+            return (*cards, version, list(key) if key != tuple(applied) else dash.no_update, dash.no_update)
+        return (dash.no_update,) * 4 + (version, dash.no_update, dash.no_update)
+    except Exception as e:
+        logging.error(f"Error refreshing metric cards: {str(e)}")
+        return dash.no_update
+
+@app.callback(
+    [
+        Output('date-range', 'min_date_allowed'),
+        Output('date-range', 'max_date_allowed'),
+        Output('date-range', 'start_date', allow_duplicate=True),
+        Output('date-range', 'end_date', allow_duplicate=True),
+        Output('b-date-range', 'min_date_allowed'),
+        Output('b-date-range', 'max_date_allowed'),
+        Output('b-date-range', 'start_date', allow_duplicate=True),
+        Output('b-date-range', 'end_date', allow_duplicate=True),
+        Output('salespeople-dropdown', 'options'),
+        Output('car-makes-dropdown', 'options'),
+        Output('car-years-dropdown', 'options'),
+        Output('b-salespeople-dropdown', 'options'),
+        Output('b-car-makes-dropdown', 'options'),
+        Output('b-car-years-dropdown', 'options')
+    ],
+    Input('live-refresh', 'n_intervals'),
+    [
+        State('seen-version', 'data'),
+        State('date-range', 'min_date_allowed'),
+        State('date-range', 'max_date_allowed'),
+        State('date-range', 'start_date'),
+        State('date-range', 'end_date'),
+        State('b-date-range', 'min_date_allowed'),
+        State('b-date-range', 'max_date_allowed'),
+        State('b-date-range', 'start_date'),
+        State('b-date-range', 'end_date')
+    ],
+    prevent_initial_call=True
+)
+def refresh_filter_choices(n_intervals, seen_version, min_date, max_date, start_date, end_date,
+                           b_min_date, b_max_date, b_start_date, b_end_date):
+    """Widen the date pickers and dropdown options to cover newly ingested sales."""
+    store = sales_store
+    first, last = date_bounds(store)
+    if (seen_version is not None and seen_version >= store['version']) or first is None:
+        return dash.no_update
+    try:
+        bounds = (first.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d'))
+        pickers = (
+            *bounds, *follow_date_bounds(start_date, end_date, (min_date, max_date)),
+            *bounds, *follow_date_bounds(b_start_date, b_end_date, (b_min_date, b_max_date))
+        )
+        options = [filter_options(col) for col in ['Salesperson', 'Car Make', 'Car Year']]
+        return (*pickers, *options, *options)
+    except Exception as e:
+        logging.error(f"Error refreshing filter choices: {str(e)}")
+        return dash.no_update
+
+# Tabs that only show auxiliary datasets, or read filters through their own callbacks,
+# render the same for every filter selection
+FILTER_INDEPENDENT_TABS = {'tab-hr', 'tab-inventory', 'tab-crm', 'tab-demo', 'tab-model', 'tab-vehicle'}
 
 @app.callback(
     Output('tabs-content', 'children'),
@@ -684,182 +2554,580 @@ def apply_filters(apply_clicks, clear_clicks, salesperson, car_make, car_model,
         Input('tabs', 'value'),
         Input('filtered-data', 'data'),
         Input('metric-dropdown', 'value'),
-        Input('reset-chart', 'n_clicks')
+        Input('reset-chart', 'n_clicks'),
+        Input('comparison-data', 'data')
     ]
 )
-def render_tab_content(tab, filtered_data, metric, reset_n_clicks):
+def render_tab_content(tab, filtered_data, metric, reset_n_clicks, comparison):
     try:
-        filtered_df = pd.read_json(filtered_data, orient='split') if filtered_data else pd.DataFrame()
-        plotly_config = {
-            'displayModeBar': True,
-            'modeBarButtonsToAdd': ['downloadImage', 'resetScale2d'],
-            'displaylogo': False
-        }
+        # Hashed once here; the stats, the cache key and the tab builder all reuse it
+        signature = filter_signature(filtered_data)
+        record_request(tab, signature, metric)
+        if comparison and tab == 'tab-kpi':
+            return cached_compute(
+                ('tab', tab, 'compare', metric, tuple(comparison['a']), tuple(comparison['b'])),
+                lambda: build_comparison_kpi(tuple(comparison['a']), tuple(comparison['b']), metric)
+            )
+        return cached_tab_content(tab, filtered_data, metric, signature)
+    except Exception as e:
+        logging.error(f"Error rendering tab content for {tab}: {str(e)}")
+        return html.P(f"Error loading content: {str(e)}", className="text-danger")
+
+def cached_tab_content(tab, filtered_data, metric, signature):
+    content_signature = 'static' if tab in FILTER_INDEPENDENT_TABS else signature
+    return cached_compute(
+        ('tab', tab, content_signature, metric),
+        lambda: build_tab_content(tab, filtered_data, metric, signature)
+    )
+
+def build_tab_content(tab, filtered_data, metric, signature):
+    """Tab children for a filtered-data payload and its signature; render_tab_content caches the result."""
+    kpi_trend = cache_get(('kpi-monthly', signature)) if tab == 'tab-kpi' else None
+    if kpi_trend is not None or tab in FILTER_INDEPENDENT_TABS or tab == 'tab-trends' or not filtered_data:
+        filtered_df = pd.DataFrame()
+    else:
+        filtered_df = pd.read_json(filtered_data, orient='split')
+    plotly_config = {
+        'displayModeBar': True,
+        'modeBarButtonsToAdd': ['downloadImage', 'resetScale2d'],
+        'displaylogo': False
+    }
 
-        if tab == 'tab-kpi':
-            if filtered_df.empty:
-                return html.P("No data available for KPI Trend", className="text-white")
+    if tab == 'tab-kpi':
+        if kpi_trend is None and not filtered_df.empty:
             kpi_trend = filtered_df.groupby('Month')[['Sale Price', 'Commission Earned']].sum().reset_index()
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=kpi_trend['Month'], 
-                y=kpi_trend['Sale Price'], 
-                name='Sale Price', 
-                line=dict(color='#00b7eb'),
-                hovertemplate='%{x}: $%{y:,.2f}'
-            ))
-            fig.add_trace(go.Scatter(
-                x=kpi_trend['Month'], 
-                y=kpi_trend['Commission Earned'], 
-                name='Commission', 
-                line=dict(color='#ff6f61'),
-                hovertemplate='%{x}: $%{y:,.2f}'
-            ))
-            fig.update_layout(
-                title=dict(
-                    text='KPI Trend: Sales and Commission Over Time',
-                    x=0.5,
-                    xanchor='center',
-                    font=dict(size=20)
-                ),
-                xaxis_title='Month',
-                yaxis_title='Amount ($)',
-                template='plotly_dark',
-                xaxis=dict(tickangle=45, gridcolor='rgba(255,255,255,0.1)'),
-                yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-                height=450,
-                hovermode='x unified',
-                margin=dict(l=50, r=50, t=80, b=50)
-            )
-            return dcc.Graph(figure=fig, config=plotly_config, id='kpi-graph')
-
-        elif tab == 'tab-3d':
-            if filtered_df.empty:
-                return html.P("No data available for 3D Sales", className="text-white")
-            scatter_data = filtered_df.sample(n=min(100, len(filtered_df)), random_state=1)
-            fig = go.Figure(data=[
-                go.Scatter3d(
-                    x=scatter_data['Commission Earned'], 
-                    y=scatter_data['Sale Price'], 
-                    z=scatter_data['Car Year'],
-                    mode='markers', 
-                    marker=dict(size=5, color=scatter_data['Car Year'], colorscale='Viridis', showscale=True)
-                )
-            ])
-            fig.update_layout(
-                title=dict(
-                    text='3D Sales: Commission vs Sale Price vs Car Year',
-                    x=0.5,
-                    xanchor='center',
-                    font=dict(size=20)
-                ),
-                scene=dict(
-                    xaxis_title='Commission Earned ($)',
-                    yaxis_title='Sale Price ($)',
-                    zaxis_title='Car Year'
-                ),
-                template='plotly_dark',
-                height=450
+        if kpi_trend is None or kpi_trend.empty:
+            return html.P("No data available for KPI Trend", className="text-white")
+        kpi_trend = with_period_labels(kpi_trend)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=kpi_trend['Month'], 
+            y=kpi_trend['Sale Price'], 
+            name='Sale Price', 
+            line=dict(color='#00b7eb'),
+            hovertemplate='%{x}: $%{y:,.2f}'
+        ))
+        fig.add_trace(go.Scatter(
+            x=kpi_trend['Month'], 
+            y=kpi_trend['Commission Earned'], 
+            name='Commission', 
+            line=dict(color='#ff6f61'),
+            hovertemplate='%{x}: $%{y:,.2f}'
+        ))
+        fig.update_layout(
+            title=dict(
+                text='KPI Trend: Sales and Commission Over Time',
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            xaxis_title='Month',
+            yaxis_title='Amount ($)',
+            template='plotly_dark',
+            xaxis=dict(tickangle=45, gridcolor='rgba(255,255,255,0.1)'),
+            yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+            height=450,
+            hovermode='x unified',
+            margin=dict(l=50, r=50, t=80, b=50)
+        )
+        return dcc.Graph(figure=encode_figure(fig), config=plotly_config, id='kpi-graph')
+
+    elif tab == 'tab-3d':
+        if filtered_df.empty:
+            return html.P("No data available for 3D Sales", className="text-white")
+        scatter_data = filtered_df.sample(n=min(100, len(filtered_df)), random_state=1)
+        fig = go.Figure(data=[
+            go.Scatter3d(
+                x=scatter_data['Commission Earned'], 
+                y=scatter_data['Sale Price'], 
+                z=scatter_data['Car Year'],
+                mode='markers', 
+                marker=dict(size=5, color=scatter_data['Car Year'], colorscale='Viridis', showscale=True)
             )
-            return dcc.Graph(figure=fig, config=plotly_config, id='3d-graph')
-
-        elif tab == 'tab-inventory':
-            if inventory_data.empty:
-                return html.P("No data available for Inventory", className="text-white")
-            return [
-                html.Label(
-                    "Search Inventory",
-                    htmlFor="inventory-search",
-                    className="text-white mb-2",
-                    style={"fontWeight": "500"}
-                ),
-                dcc.Input(
-                    id='inventory-search',
-                    type='text',
-                    placeholder='Search by Part Name or Car Make...',
-                    className="mb-3",
-                    style={'width': '100%'},
-                    aria_describedby="inventory-search-tooltip"
-                ),
-                dbc.Tooltip(
-                    "Search inventory by part name or car make",
-                    target="inventory-search",
-                    placement="top"
-                ),
-                dcc.Loading(
-                    id="loading-inventory",
-                    type="circle",
-                    children=dash_table.DataTable(
-                        id='inventory-table',
-                        columns=[
-                            {"name": "Part ID", "id": "Part ID"},
-                            {"name": "Part Name", "id": "Part Name"},
-                            {"name": "Car Make", "id": "Car Make"},
-                            {"name": "Stock Level", "id": "Stock Level"},
-                            {"name": "Reorder Level", "id": "Reorder Level"},
-                            {"name": "Unit Cost", "id": "Unit Cost"}
-                        ],
-                        data=inventory_data.to_dict('records'),
-                        style_table={'overflowX': 'auto'},
-                        style_cell={'textAlign': 'left', 'padding': '5px'},
-                        style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
-                        style_data={'backgroundColor': '#34495e', 'color': 'white'},
-                        page_size=10
+        ])
+        fig.update_layout(
+            title=dict(
+                text='3D Sales: Commission vs Sale Price vs Car Year',
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            scene=dict(
+                xaxis_title='Commission Earned ($)',
+                yaxis_title='Sale Price ($)',
+                zaxis_title='Car Year'
+            ),
+            template='plotly_dark',
+            height=450
+        )
+        return dcc.Graph(figure=encode_figure(fig), config=plotly_config, id='3d-graph')
+
+    elif tab == 'tab-trends':
+        # The default series is the first thing trends-graph draws, so this check primes its cache
+        if not trend_series(filtered_data, metric, None, signature)['labels']:
+            return html.P("No data available for Trends", className="text-white")
+        return [
+            dbc.Row([
+                dbc.Col([
+                    html.Label(
+                        "Slice By",
+                        htmlFor="trends-slice-dropdown",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Dropdown(
+                        id='trends-slice-dropdown',
+                        options=[{'label': 'All Sales', 'value': 'All'}] + [{'label': x, 'value': x} for x in ['Car Make', 'Car Model']],
+                        value='All',
+                        className="mb-2",
+                        clearable=False
                     )
-                )
-            ]
-
-        elif tab == 'tab-crm':
-            if crm_data.empty:
-                return html.P("No data available for CRM", className="text-white")
-            return [
-                html.Label(
-                    "Search CRM",
-                    htmlFor="crm-search",
-                    className="text-white mb-2",
-                    style={"fontWeight": "500"}
-                ),
-                dcc.Input(
-                    id='crm-search',
-                    type='text',
-                    placeholder='Search by Customer Name or Salesperson...',
-                    className="mb-3",
-                    style={'width': '100%'},
-                    aria_describedby="crm-search-tooltip"
-                ),
-                dbc.Tooltip(
-                    "Search CRM by customer name or salesperson",
-                    target="crm-search",
-                    placement="top"
-                ),
-                dcc.Loading(
-                    id="loading-crm",
-                    type="circle",
-                    children=dash_table.DataTable(
-                        id='crm-table',
-                        columns=[
-                            {"name": "Customer ID", "id": "Customer ID"},
-                            {"name": "Customer Name", "id": "Customer Name"},
-                            {"name": "Contact Date", "id": "Contact Date"},
-                            {"name": "Interaction Type", "id": "Interaction Type"},
-                            {"name": "Salesperson", "id": "Salesperson"},
-                            {"name": "Satisfaction Score", "id": "Satisfaction Score"}
+                ], width={"size": 3, "xs": 12}),
+                dbc.Col([
+                    html.Label(
+                        "Analysis",
+                        htmlFor="trends-view-dropdown",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Dropdown(
+                        id='trends-view-dropdown',
+                        options=[
+                            {'label': 'Rolling Sum', 'value': 'rolling-sum'},
+                            {'label': 'Rolling Mean', 'value': 'rolling-mean'},
+                            {'label': 'Cumulative Total', 'value': 'cumulative'},
+                            {'label': 'Year-over-Year Change', 'value': 'yoy'}
                         ],
-                        data=crm_data.to_dict('records'),
-                        style_table={'overflowX': 'auto'},
-                        style_cell={'textAlign': 'left', 'padding': '5px'},
-                        style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
-                        style_data={'backgroundColor': '#34495e', 'color': 'white'},
-                        page_size=10
+                        value='rolling-sum',
+                        className="mb-2",
+                        clearable=False
+                    )
+                ], width={"size": 3, "xs": 12}),
+                dbc.Col([
+                    html.Label(
+                        "Rolling Windows",
+                        htmlFor="trends-window-checklist",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Checklist(
+                        id='trends-window-checklist',
+                        options=[{'label': f" {w} days", 'value': w} for w in ROLLING_WINDOWS],
+                        value=[30],
+                        inline=True,
+                        className="text-white mb-2",
+                        inputStyle={"marginLeft": "10px"}
+                    )
+                ], width={"size": 6, "xs": 12})
+            ], className="mb-3"),
+            dcc.Loading(
+                id="loading-trends",
+                type="circle",
+                children=dcc.Graph(id='trends-graph', config=plotly_config)
+            )
+        ]
+
+    elif tab == 'tab-vehicle':
+        if vehicle_rollup is None:
+            return html.P("No data available for Vehicle Sales", className="text-white")
+        return [
+            dbc.Row([
+                dbc.Col([
+                    html.Label(
+                        "Size By",
+                        htmlFor="vehicle-value-dropdown",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Dropdown(
+                        id='vehicle-value-dropdown',
+                        options=[{'label': 'Units Sold', 'value': 'units'}, {'label': 'Revenue', 'value': 'revenue'}],
+                        value='units',
+                        className="mb-2",
+                        clearable=False
+                    )
+                ], width={"size": 3, "xs": 12}),
+                dbc.Col([
+                    html.Label(
+                        "Chart",
+                        htmlFor="vehicle-view-dropdown",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Dropdown(
+                        id='vehicle-view-dropdown',
+                        options=[{'label': 'Sunburst', 'value': 'sunburst'}, {'label': 'Treemap', 'value': 'treemap'}],
+                        value='sunburst',
+                        className="mb-2",
+                        clearable=False
                     )
+                ], width={"size": 3, "xs": 12})
+            ], className="mb-3"),
+            dcc.Loading(
+                id="loading-vehicle",
+                type="circle",
+                children=dcc.Graph(id='vehicle-graph', config=plotly_config)
+            ),
+            html.H5(id='vehicle-detail-title', className="text-white mt-3"),
+            dash_table.DataTable(
+                id='vehicle-detail',
+                columns=[{"name": col, "id": col} for col in ['Name', 'Units', 'Revenue', 'Avg Price', 'Unit Share (%)']],
+                sort_action='native',
+                style_table={'overflowX': 'auto'},
+                style_cell={'textAlign': 'left', 'padding': '5px'},
+                style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
+                style_data={'backgroundColor': '#34495e', 'color': 'white'},
+                page_size=10
+            )
+        ]
+
+    elif tab == 'tab-model':
+        if model_sketches is None:
+            return html.P("No data available for Model Comparison", className="text-white")
+        return [
+            dbc.Row([
+                dbc.Col([
+                    html.Label(
+                        "Compare By",
+                        htmlFor="model-group-dropdown",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Dropdown(
+                        id='model-group-dropdown',
+                        options=[{'label': x, 'value': x} for x in SKETCH_GROUP_BY],
+                        value='Car Model',
+                        className="mb-2",
+                        clearable=False
+                    )
+                ], width={"size": 3, "xs": 12}),
+                dbc.Col([
+                    html.Label(
+                        "Chart",
+                        htmlFor="model-view-dropdown",
+                        className="text-white",
+                        style={"fontWeight": "500"}
+                    ),
+                    dcc.Dropdown(
+                        id='model-view-dropdown',
+                        options=[{'label': 'Box Plot', 'value': 'box'}, {'label': 'Violin Plot', 'value': 'violin'}],
+                        value='box',
+                        className="mb-2",
+                        clearable=False
+                    )
+                ], width={"size": 3, "xs": 12})
+            ], className="mb-3"),
+            dcc.Loading(
+                id="loading-model",
+                type="circle",
+                children=dcc.Graph(id='model-graph', config=plotly_config)
+            ),
+            dash_table.DataTable(
+                id='model-stats',
+                columns=[{"name": col, "id": col} for col in ['Group', 'Sales', 'Median', 'P90', 'IQR', 'Mean', 'Min', 'Max']],
+                sort_action='native',
+                style_table={'overflowX': 'auto'},
+                style_cell={'textAlign': 'left', 'padding': '5px'},
+                style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
+                style_data={'backgroundColor': '#34495e', 'color': 'white'},
+                page_size=10
+            )
+        ]
+
+    elif tab == 'tab-inventory':
+        if inventory_data.empty:
+            return html.P("No data available for Inventory", className="text-white")
+        inventory_view = reorder_view(inventory_data, reorder_state)
+        status_counts = inventory_view['Reorder Status'].value_counts()
+        return [
+            html.P(
+                f"Reorder Now: {status_counts.get('Reorder Now', 0)} | "
+                f"At Risk (< {STOCKOUT_ALERT_DAYS} days of stock): {status_counts.get('At Risk', 0)} | "
+                f"Demand based on the last {VELOCITY_WINDOW_DAYS} days of sales per Car Make",
+                className="text-white",
+                role="status"
+            ),
+            html.Label(
+                "Search Inventory",
+                htmlFor="inventory-search",
+                className="text-white mb-2",
+                style={"fontWeight": "500"}
+            ),
+            dcc.Input(
+                id='inventory-search',
+                type='text',
+                placeholder='Search by Part Name or Car Make...',
+                className="mb-3",
+                style={'width': '100%'},
+                aria_describedby="inventory-search-tooltip"
+            ),
+            dbc.Tooltip(
+                "Search inventory by part name or car make",
+                target="inventory-search",
+                placement="top"
+            ),
+            dcc.Checklist(
+                id='inventory-alerts-only',
+                options=[{'label': ' Show only parts that need reordering', 'value': 'alerts'}],
+                value=[],
+                className="text-white mb-2"
+            ),
+            dcc.Loading(
+                id="loading-inventory",
+                type="circle",
+                children=dash_table.DataTable(
+                    id='inventory-table',
+                    columns=[
+                        {"name": "Part ID", "id": "Part ID"},
+                        {"name": "Part Name", "id": "Part Name"},
+                        {"name": "Car Make", "id": "Car Make"},
+                        {"name": "Stock Level", "id": "Stock Level"},
+                        {"name": "Reorder Level", "id": "Reorder Level"},
+                        {"name": "Unit Cost", "id": "Unit Cost"},
+                        {"name": "Daily Demand", "id": "Daily Demand"},
+                        {"name": "Days to Stockout", "id": "Days to Stockout"},
+                        {"name": "Reorder Status", "id": "Reorder Status"}
+                    ],
+                    data=inventory_view.to_dict('records'),
+                    style_table={'overflowX': 'auto'},
+                    style_cell={'textAlign': 'left', 'padding': '5px'},
+                    style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
+                    style_data={'backgroundColor': '#34495e', 'color': 'white'},
+                    style_data_conditional=[
+                        {'if': {'filter_query': '{Reorder Status} = "Reorder Now"'}, 'backgroundColor': '#c0392b'},
+                        {'if': {'filter_query': '{Reorder Status} = "At Risk"'}, 'backgroundColor': '#d35400'}
+                    ],
+                    page_size=10
                 )
-            ]
+            )
+        ]
 
-        logging.info(f"Tab content rendered for {tab}")
-        return html.P("Select a tab to view content.", className="text-white")
-    except Exception as e:
-        logging.error(f"Error rendering tab content for {tab}: {str(e)}")
-        return html.P(f"Error loading content: {str(e)}", className="text-danger")
+    elif tab == 'tab-crm':
+        if crm_data.empty:
+            return html.P("No data available for CRM", className="text-white")
+        return [
+            html.Label(
+                "Search CRM",
+                htmlFor="crm-search",
+                className="text-white mb-2",
+                style={"fontWeight": "500"}
+            ),
+            dcc.Input(
+                id='crm-search',
+                type='text',
+                placeholder='Search by Customer Name or Salesperson...',
+                className="mb-3",
+                style={'width': '100%'},
+                aria_describedby="crm-search-tooltip"
+            ),
+            dbc.Tooltip(
+                "Search CRM by customer name or salesperson",
+                target="crm-search",
+                placement="top"
+            ),
+            dcc.Loading(
+                id="loading-crm",
+                type="circle",
+                children=dash_table.DataTable(
+                    id='crm-table',
+                    columns=[
+                        {"name": "Customer ID", "id": "Customer ID"},
+                        {"name": "Customer Name", "id": "Customer Name"},
+                        {"name": "Contact Date", "id": "Contact Date"},
+                        {"name": "Interaction Type", "id": "Interaction Type"},
+                        {"name": "Salesperson", "id": "Salesperson"},
+                        {"name": "Satisfaction Score", "id": "Satisfaction Score"}
+                    ],
+                    data=with_date_labels(crm_data, ['Contact Date']).to_dict('records'),
+                    style_table={'overflowX': 'auto'},
+                    style_cell={'textAlign': 'left', 'padding': '5px'},
+                    style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
+                    style_data={'backgroundColor': '#34495e', 'color': 'white'},
+                    page_size=10
+                )
+            )
+        ]
+
+    elif tab == 'tab-hr':
+        if hr_summary is None:
+            return html.P("No data available for HR Overview", className="text-white")
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=hr_summary['Name'],
+            y=hr_summary['Hours Worked'] - hr_summary['Overtime Hours'],
+            name='Regular Hours',
+            marker_color='#00b7eb',
+            hovertemplate='%{x}: %{y:,.1f} h'
+        ))
+        fig.add_trace(go.Bar(
+            x=hr_summary['Name'],
+            y=hr_summary['Overtime Hours'],
+            name='Overtime Hours',
+            marker_color='#ff6f61',
+            hovertemplate='%{x}: %{y:,.1f} h'
+        ))
+        fig.update_layout(
+            title=dict(
+                text='Hours Worked and Overtime by Employee',
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            barmode='stack',
+            xaxis_title='Employee',
+            yaxis_title='Hours',
+            template='plotly_dark',
+            xaxis=dict(tickangle=45, gridcolor='rgba(255,255,255,0.1)'),
+            yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+            height=450,
+            margin=dict(l=50, r=50, t=80, b=50)
+        )
+        return [
+            dcc.Graph(figure=encode_figure(fig), config=plotly_config, id='hr-graph'),
+            dash_table.DataTable(
+                id='hr-table',
+                columns=[{"name": col, "id": col} for col in hr_summary.columns],
+                data=hr_summary.to_dict('records'),
+                sort_action='native',
+                style_table={'overflowX': 'auto'},
+                style_cell={'textAlign': 'left', 'padding': '5px'},
+                style_header={'backgroundColor': '#2c3e50', 'fontWeight': 'bold', 'color': 'white'},
+                style_data={'backgroundColor': '#34495e', 'color': 'white'},
+                page_size=10
+            )
+        ]
+
+    elif tab == 'tab-demo':
+        if customer_facts is None:
+            return html.P("No data available for Demographics", className="text-white")
+        cells = customer_rollup(customer_facts, ['Age Group', 'Region'])
+        age_groups, regions = cells['labels']
+        heatmap = go.Figure(data=[
+            go.Heatmap(
+                z=cells['avg_purchase'],
+                x=regions,
+                y=age_groups,
+                customdata=cells['customers'],
+                colorscale='Viridis',
+                hovertemplate='%{y}, %{x}<br>Avg Purchase: $%{z:,.0f}<br>Customers: %{customdata}<extra></extra>'
+            )
+        ])
+        heatmap.update_layout(
+            title=dict(
+                text='Average Purchase Amount by Age Group and Region',
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            xaxis_title='Region',
+            yaxis_title='Age Group',
+            template='plotly_dark',
+            height=450,
+            margin=dict(l=50, r=50, t=80, b=50)
+        )
+
+        breakdown = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=('By Age Group', 'By Preferred Make'),
+            specs=[[{"secondary_y": True}, {"secondary_y": True}]]
+        )
+        for col, dim in enumerate(['Age Group', 'Preferred Make'], start=1):
+            rollup = customer_rollup(customer_facts, [dim])
+            breakdown.add_trace(go.Bar(
+                x=rollup['labels'][0],
+                y=rollup['avg_purchase'],
+                name='Avg Purchase',
+                marker_color='#00b7eb',
+                showlegend=col == 1,
+                hovertemplate='%{x}: $%{y:,.0f}'
+            ), row=1, col=col, secondary_y=False)
+            breakdown.add_trace(go.Scatter(
+                x=rollup['labels'][0],
+                y=rollup['avg_satisfaction'],
+                name='Avg Satisfaction',
+                mode='markers+lines',
+                line=dict(color='#ff6f61'),
+                showlegend=col == 1,
+                hovertemplate='%{x}: %{y:.2f}'
+            ), row=1, col=col, secondary_y=True)
+        breakdown.update_yaxes(title_text='Amount ($)', secondary_y=False, gridcolor='rgba(255,255,255,0.1)')
+        breakdown.update_yaxes(title_text='Satisfaction', range=[0, 5], secondary_y=True)
+        breakdown.update_layout(
+            title=dict(
+                text='Purchase Amount and Satisfaction by Customer Segment',
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            template='plotly_dark',
+            height=450,
+            margin=dict(l=50, r=50, t=80, b=50)
+        )
+        return [
+            dcc.Graph(figure=encode_figure(heatmap, tolerance=0.5), config=plotly_config, id='demo-heatmap'),
+            dcc.Graph(figure=encode_figure(breakdown), config=plotly_config, id='demo-breakdown')
+        ]
+
+    logging.info(f"Tab content rendered for {tab}")
+    return html.P("Select a tab to view content.", className="text-white")
+
+def build_comparison_kpi(key_a, key_b, metric):
+    """KPI trend of `metric` for filter sets A and B, with the monthly change from A to B."""
+    comparison = compare_filters(key_a, key_b)
+    monthly = comparison['monthly']
+    if monthly.empty:
+        return html.P("No data available for KPI Comparison", className="text-white")
+    months = period_labels(monthly['Month'], 'M')
+    b_months = period_labels(monthly['B Month'], 'M')
+    delta = monthly[f'{metric} B'] - monthly[f'{metric} A']
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Bar(
+        x=months,
+        y=delta,
+        name='Δ (B − A)',
+        marker_color=np.where(delta >= 0, '#2ecc71', '#e74c3c'),
+        opacity=0.5,
+        hovertemplate='%{x}: Δ $%{y:,.2f}<extra></extra>'
+    ), secondary_y=True)
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=monthly[f'{metric} A'],
+        name=f'{metric} (A)',
+        line=dict(color='#00b7eb'),
+        hovertemplate='%{x}: $%{y:,.2f}'
+    ), secondary_y=False)
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=monthly[f'{metric} B'],
+        customdata=b_months,
+        name=f'{metric} (B)',
+        line=dict(color='#ff6f61'),
+        hovertemplate='%{customdata}: $%{y:,.2f}'
+    ), secondary_y=False)
+    shift = comparison['shift']
+    fig.update_layout(
+        title=dict(
+            text=f'KPI Comparison: {metric}, A vs B',
+            x=0.5,
+            xanchor='center',
+            font=dict(size=20)
+        ),
+        xaxis_title='Month' if shift == 0 else f'Month (A; B shifted by {shift:+d} months)',
+        template='plotly_dark',
+        xaxis=dict(tickangle=45, gridcolor='rgba(255,255,255,0.1)'),
+        yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+        height=450,
+        hovermode='x unified',
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    fig.update_yaxes(title_text='Amount ($)', secondary_y=False)
+    fig.update_yaxes(title_text='Change ($)', secondary_y=True, showgrid=False)
+    plotly_config = {
+        'displayModeBar': True,
+        'modeBarButtonsToAdd': ['downloadImage', 'resetScale2d'],
+        'displaylogo': False
+    }
+    return dcc.Graph(figure=encode_figure(fig), config=plotly_config, id='kpi-graph')
 
 @app.callback(
     Output('collapse-filters', 'is_open'),
@@ -881,7 +3149,14 @@ def toggle_collapse(n_clicks, is_open):
         Output('date-range', 'start_date'),
         Output('date-range', 'end_date'),
         Output('notification-toast', 'is_open'),
-        Output('notification-toast', 'children')
+        Output('notification-toast', 'children'),
+        Output('compare-mode', 'value'),
+        Output('b-salespeople-dropdown', 'value'),
+        Output('b-car-makes-dropdown', 'value'),
+        Output('b-car-models-dropdown', 'value'),
+        Output('b-car-years-dropdown', 'value'),
+        Output('b-date-range', 'start_date'),
+        Output('b-date-range', 'end_date')
     ],
     [
         Input('reset-filters', 'n_clicks'),
@@ -893,8 +3168,10 @@ def reset_filters(reset_clicks, clear_clicks):
     if reset_clicks or clear_clicks:
         return (
             'All', 'All', 'All', 'All', 'Sale Price',
-            df['Date'].min(), df['Date'].max(),
-            True, "Filters reset successfully!"
+            *date_bounds(),
+            True, "Filters reset successfully!",
+            [], 'All', 'All', 'All', 'All',
+            *date_bounds()
         )
     return dash.no_update
 
@@ -906,7 +3183,7 @@ def reset_filters(reset_clicks, clear_clicks):
 )
 def download_data(n_clicks, data):
     try:
-        filtered_df = pd.read_json(data, orient='split')
+        filtered_df = with_period_labels(pd.read_json(data, orient='split'))
         return dcc.send_data_frame(filtered_df.to_csv, "filtered_automotive_data.csv")
     except Exception as e:
         logging.error(f"Error downloading data: {str(e)}")
@@ -989,16 +3266,24 @@ app.clientside_callback(
 # Callback for inventory search
 @app.callback(
     Output('inventory-table', 'data'),
-    Input('inventory-search', 'value')
+    [
+        Input('inventory-search', 'value'),
+        Input('inventory-alerts-only', 'value')
+    ]
 )
-def update_inventory_table(search_term):
+def update_inventory_table(search_term, alerts_only):
+    if reorder_state is None:
+        return []
     try:
+        inventory_view = reorder_view(inventory_data, reorder_state)
+        if alerts_only:
+            inventory_view = inventory_view[inventory_view['Reorder Status'] != 'OK']
         if not search_term:
-            return inventory_data.to_dict('records')
+            return inventory_view.to_dict('records')
         search_term = search_term.lower()
-        filtered = inventory_data[
-            inventory_data['Part Name'].str.lower().str.contains(search_term) |
-            inventory_data['Car Make'].str.lower().str.contains(search_term)
+        filtered = inventory_view[
+            inventory_view['Part Name'].str.lower().str.contains(search_term) |
+            inventory_view['Car Make'].str.lower().str.contains(search_term)
         ]
         return filtered.to_dict('records')
     except Exception as e:
@@ -1013,16 +3298,522 @@ def update_inventory_table(search_term):
 def update_crm_table(search_term):
     try:
         if not search_term:
-            return crm_data.to_dict('records')
+            return with_date_labels(crm_data, ['Contact Date']).to_dict('records')
         search_term = search_term.lower()
         filtered = crm_data[
             crm_data['Customer Name'].str.lower().str.contains(search_term) |
             crm_data['Salesperson'].str.lower().str.contains(search_term)
         ]
-        return filtered.to_dict('records')
+        return with_date_labels(filtered, ['Contact Date']).to_dict('records')
     except Exception as e:
         logging.error(f"Error filtering CRM table: {str(e)}")
-        return crm_data.to_dict('records')
+        return with_date_labels(crm_data, ['Contact Date']).to_dict('records')
+
+# Callback for trend analytics
+def trend_series(filtered_data, metric, slice_by, signature=None):
+    """Trend series for a filtered-data payload, cached per payload signature, metric and slice."""
+    def compute():
+        filtered_df = pd.read_json(filtered_data, orient='split') if filtered_data else pd.DataFrame()
+        return compute_trend_series(filtered_df, metric, slice_by) if not filtered_df.empty else {'labels': []}
+    if signature is None:
+        signature = filter_signature(filtered_data)
+    return cached_compute(('trends', signature, metric, slice_by), compute)
+
+@app.callback(
+    Output('trends-graph', 'figure'),
+    [
+        Input('trends-slice-dropdown', 'value'),
+        Input('trends-view-dropdown', 'value'),
+        Input('trends-window-checklist', 'value'),
+        Input('filtered-data', 'data'),
+        Input('metric-dropdown', 'value')
+    ]
+)
+def update_trends_graph(slice_by, view, windows, filtered_data, metric):
+    try:
+        slice_by = None if slice_by in (None, 'All') else slice_by
+        series = trend_series(filtered_data, metric, slice_by)
+        if not series['labels']:
+            return go.Figure().update_layout(template='plotly_dark', title="No data available for Trends")
+
+        fig = go.Figure()
+        labels = series['labels']
+        if view == 'yoy':
+            for i, label in enumerate(labels):
+                fig.add_trace(go.Bar(
+                    x=series['months'],
+                    y=series['yoy_delta'][i],
+                    name=str(label),
+                    hovertemplate='%{x}: $%{y:,.2f}'
+                ))
+            title, x_title = f'Year-over-Year Change in {metric} by Month', 'Month'
+        elif view == 'cumulative':
+            for i, label in enumerate(labels):
+                fig.add_trace(go.Scatter(
+                    x=series['days'],
+                    y=series['cumulative'][i],
+                    name=str(label),
+                    hovertemplate='%{x|%Y-%m-%d}: $%{y:,.2f}'
+                ))
+            title, x_title = f'Cumulative {metric}', 'Date'
+        else:
+            stat = 'mean' if view == 'rolling-mean' else 'sum'
+            for window in sorted(windows or [30]):
+                for i, label in enumerate(labels):
+                    name = f"{window}-day" if slice_by is None else f"{label} ({window}-day)"
+                    fig.add_trace(go.Scatter(
+                        x=series['days'],
+                        y=series['rolling'][window][stat][i],
+                        name=name,
+                        hovertemplate='%{x|%Y-%m-%d}: $%{y:,.2f}'
+                    ))
+            title, x_title = f'Rolling {stat.capitalize()} of {metric}', 'Date'
+
+        fig.update_layout(
+            title=dict(
+                text=title,
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            xaxis_title=x_title,
+            yaxis_title='Amount ($)',
+            template='plotly_dark',
+            xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+            yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+            height=450,
+            hovermode='x unified',
+            margin=dict(l=50, r=50, t=80, b=50)
+        )
+        logging.info(f"Trends graph updated ({view}, slice={slice_by})")
+        return encode_figure(fig)
+    except Exception as e:
+        logging.error(f"Error updating trends graph: {str(e)}")
+        return go.Figure().update_layout(template='plotly_dark', title=f"Error: {str(e)}")
+
+# Callbacks for vehicle sales
+@app.callback(
+    Output('vehicle-graph', 'figure'),
+    [
+        Input('vehicle-value-dropdown', 'value'),
+        Input('vehicle-view-dropdown', 'value'),
+        Input('applied-filters', 'data')
+    ]
+)
+def update_vehicle_graph(value_by, view, applied):
+    try:
+        key = tuple(applied) if applied else DEFAULT_FILTERS
+        tree = cached_compute(('vehicle', key), lambda: vehicle_tree(key))
+        if len(tree['ids']) == 0:
+            return go.Figure().update_layout(template='plotly_dark', title="No data available for Vehicle Sales")
+        trace = go.Treemap if view == 'treemap' else go.Sunburst
+        fig = go.Figure(trace(
+            ids=tree['ids'],
+            labels=tree['labels'],
+            parents=tree['parents'],
+            values=tree[value_by],
+            branchvalues='total',
+            customdata=np.column_stack([tree['units'], tree['revenue']]),
+            hovertemplate='%{label}<br>Units: %{customdata[0]:,}<br>Revenue: $%{customdata[1]:,.0f}<extra></extra>'
+        ))
+        fig.update_layout(
+            title=dict(
+                text=f"Vehicle Sales by Make, Model and Year ({'Revenue' if value_by == 'revenue' else 'Units'})",
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            template='plotly_dark',
+            height=550,
+            margin=dict(l=20, r=20, t=80, b=20)
+        )
+        logging.info(f"Vehicle sales updated ({view}, {value_by})")
+        return encode_figure(fig)
+    except Exception as e:
+        logging.error(f"Error updating vehicle sales: {str(e)}")
+        return go.Figure().update_layout(template='plotly_dark', title=f"Error: {str(e)}")
+
+@app.callback(
+    [
+        Output('vehicle-detail-title', 'children'),
+        Output('vehicle-detail', 'data')
+    ],
+    [
+        Input('vehicle-graph', 'clickData'),
+        Input('applied-filters', 'data')
+    ]
+)
+def update_vehicle_detail(click_data, applied):
+    """Children of the clicked node (makes at the top level), read from the cached rollup tree."""
+    try:
+        key = tuple(applied) if applied else DEFAULT_FILTERS
+        tree = cached_compute(('vehicle', key), lambda: vehicle_tree(key))
+        node = click_data['points'][0].get('id', '') if click_data else ''
+        children = tree['parents'] == node
+        if node and not children.any():
+            # A year leaf has no children: show it against its siblings
+            node = tree['parents'][tree['ids'] == node][0] if (tree['ids'] == node).any() else ''
+            children = tree['parents'] == node
+        units, revenue = tree['units'][children], tree['revenue'][children]
+        detail = pd.DataFrame({
+            'Name': tree['labels'][children],
+            'Units': units,
+            'Revenue': revenue.round(2),
+            'Avg Price': (revenue / np.maximum(units, 1)).round(2),
+            'Unit Share (%)': (units / max(units.sum(), 1) * 100).round(1),
+        })
+        title = f"Breakdown of {node.replace('/', ' ')}" if node else "Breakdown by Car Make"
+        return title, detail.to_dict('records')
+    except Exception as e:
+        logging.error(f"Error updating vehicle detail: {str(e)}")
+        return "", []
+
+# Callback for model comparison
+@app.callback(
+    [
+        Output('model-graph', 'figure'),
+        Output('model-stats', 'data')
+    ],
+    [
+        Input('model-group-dropdown', 'value'),
+        Input('model-view-dropdown', 'value'),
+        Input('applied-filters', 'data'),
+        Input('metric-dropdown', 'value')
+    ]
+)
+def update_model_graph(group_by, view, applied, metric):
+    try:
+        key = tuple(applied) if applied else DEFAULT_FILTERS
+        stats = cached_compute(('model', key, metric, group_by), lambda: model_distributions(key, metric, group_by))
+        if not stats['labels']:
+            return go.Figure().update_layout(template='plotly_dark', title="No data available for Model Comparison"), []
+
+        labels = stats['labels']
+        fig = go.Figure()
+        if view == 'violin':
+            # Violins drawn from the merged histograms: smoothed bin densities mirrored around each position
+            edges = stats['edges']
+            centers = (edges[:-1] + edges[1:]) / 2
+            kernel = np.array([1, 4, 6, 4, 1]) / 16
+            for i, label in enumerate(labels):
+                density = np.convolve(stats['counts'][i], kernel, mode='same')
+                inside = (centers >= stats['min'][i] - (edges[1] - edges[0])) & (centers <= stats['max'][i] + (edges[1] - edges[0]))
+                y, width = centers[inside], density[inside] / density.max() * 0.4
+                fig.add_trace(go.Scatter(
+                    x=np.concatenate([i - width, (i + width)[::-1]]),
+                    y=np.concatenate([y, y[::-1]]),
+                    fill='toself',
+                    mode='lines',
+                    line=dict(width=1),
+                    name=label,
+                    hoverinfo='skip',
+                    showlegend=False
+                ))
+            fig.add_trace(go.Scatter(
+                x=np.arange(len(labels)),
+                y=stats['median'],
+                mode='markers',
+                marker=dict(color='white', symbol='line-ew-open', size=18),
+                customdata=np.column_stack([stats['q1'], stats['q3'], stats['p90'], stats['count']]),
+                text=labels,
+                name='Median',
+                hovertemplate='%{text}<br>Median: $%{y:,.0f}<br>IQR: $%{customdata[0]:,.0f} – $%{customdata[1]:,.0f}'
+                              '<br>P90: $%{customdata[2]:,.0f}<br>Sales: %{customdata[3]:,}<extra></extra>'
+            ))
+            fig.update_xaxes(tickvals=np.arange(len(labels)), ticktext=labels)
+        else:
+            iqr = stats['q3'] - stats['q1']
+            fig.add_trace(go.Box(
+                x=labels,
+                q1=stats['q1'],
+                median=stats['median'],
+                q3=stats['q3'],
+                mean=stats['mean'],
+                lowerfence=np.maximum(stats['min'], stats['q1'] - 1.5 * iqr),
+                upperfence=np.minimum(stats['max'], stats['q3'] + 1.5 * iqr),
+                name=metric,
+                marker_color='#00b7eb',
+                boxmean=True
+            ))
+        fig.update_layout(
+            title=dict(
+                text=f'{metric} Distribution by {group_by}',
+                x=0.5,
+                xanchor='center',
+                font=dict(size=20)
+            ),
+            xaxis_title=group_by,
+            yaxis_title=f'{metric} ($)',
+            template='plotly_dark',
+            xaxis=dict(tickangle=45, gridcolor='rgba(255,255,255,0.1)'),
+            yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+            height=450,
+            margin=dict(l=50, r=50, t=80, b=50)
+        )
+        table = pd.DataFrame({
+            'Group': labels,
+            'Sales': stats['count'],
+            'Median': stats['median'].round(2),
+            'P90': stats['p90'].round(2),
+            'IQR': (stats['q3'] - stats['q1']).round(2),
+            'Mean': stats['mean'].round(2),
+            'Min': stats['min'].round(2),
+            'Max': stats['max'].round(2),
+        })
+        logging.info(f"Model comparison updated ({view}, by {group_by})")
+        return encode_figure(fig), table.to_dict('records')
+    except Exception as e:
+        logging.error(f"Error updating model comparison: {str(e)}")
+        return go.Figure().update_layout(template='plotly_dark', title=f"Error: {str(e)}"), []
+
+# Callbacks for saved views
+@app.callback(
+    [
+        Output('saved-views-dropdown', 'options'),
+        Output('notification-toast', 'is_open', allow_duplicate=True),
+        Output('notification-toast', 'children', allow_duplicate=True)
+    ],
+    [
+        Input('save-view', 'n_clicks'),
+        Input('delete-view', 'n_clicks'),
+        State('view-name-input', 'value'),
+        State('saved-views-dropdown', 'value'),
+        State('applied-filters', 'data'),
+        State('tabs', 'value'),
+        State('metric-dropdown', 'value')
+    ],
+    prevent_initial_call='initial_duplicate'
+)
+def manage_saved_views(save_clicks, delete_clicks, name, selected, applied, tab, metric):
+    try:
+        ctx = dash.callback_context
+        triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
+        message = None
+        if triggered_id == 'save-view' and save_clicks:
+            if not name or not name.strip():
+                message = "Enter a name for the view first."
+            else:
+                save_view(name.strip(), tuple(applied) if applied else DEFAULT_FILTERS, tab, metric)
+                message = f"View '{name.strip()}' saved."
+        elif triggered_id == 'delete-view' and delete_clicks and selected:
+            delete_view(selected)
+            message = f"View '{selected}' deleted."
+        options = [{'label': x, 'value': x} for x in list_saved_views()]
+        return options, message is not None, message or ""
+    except Exception as e:
+        logging.error(f"Error managing saved views: {str(e)}")
+        return dash.no_update, True, f"Error: {str(e)}"
+
+@app.callback(
+    [
+        Output('salespeople-dropdown', 'value', allow_duplicate=True),
+        Output('car-makes-dropdown', 'value', allow_duplicate=True),
+        Output('car-models-dropdown', 'value', allow_duplicate=True),
+        Output('car-years-dropdown', 'value', allow_duplicate=True),
+        Output('date-range', 'start_date', allow_duplicate=True),
+        Output('date-range', 'end_date', allow_duplicate=True),
+        Output('metric-dropdown', 'value', allow_duplicate=True),
+        Output('tabs', 'value', allow_duplicate=True),
+        Output('filtered-data', 'data', allow_duplicate=True),
+        Output('total-sales', 'children', allow_duplicate=True),
+        Output('total-commission', 'children', allow_duplicate=True),
+        Output('avg-price', 'children', allow_duplicate=True),
+        Output('trans-count', 'children', allow_duplicate=True),
+        Output('applied-filters', 'data', allow_duplicate=True),
+        Output('comparison-data', 'data', allow_duplicate=True),
+        Output('compare-mode', 'value', allow_duplicate=True),
+        Output('notification-toast', 'is_open', allow_duplicate=True),
+        Output('notification-toast', 'children', allow_duplicate=True)
+    ],
+    Input('open-view', 'n_clicks'),
+    State('saved-views-dropdown', 'value'),
+    prevent_initial_call=True
+)
+def open_saved_view(n_clicks, name):
+    """Restore a saved view; its materialized results are put in the result cache before the tab renders."""
+    try:
+        if not name:
+            return (dash.no_update,) * 16 + (True, "Select a saved view to open.")
+        note_activity()
+        view = open_view(name)
+        if view is None:
+            return (dash.no_update,) * 16 + (True, f"View '{name}' no longer exists.")
+        key = view['filters']
+        payload, total_sales, total_comm, avg_price, trans_count = filter_sales(*key)
+        start_date, end_date = (key[4], key[5]) if key[4] and key[5] else date_bounds()
+        logging.info(f"Opened saved view '{name}'")
+        return (
+            *key[:4], start_date, end_date, view['metric'], view['tab'],
+            payload, total_sales, total_comm, avg_price, trans_count,
+            list(key), None, [],
+            True, f"View '{name}' opened."
+        )
+    except Exception as e:
+        logging.error(f"Error opening saved view: {str(e)}")
+        return (dash.no_update,) * 16 + (True, f"Error: {str(e)}")
+
+# Background cache warmer
+WARM_ENABLED = os.environ.get('DASHBOARD_CACHE_WARMER', '1') == '1'
+WARM_CONFIG_FILE = os.environ.get('DASHBOARD_WARM_CONFIG')
+WARM_TOP_N = int(os.environ.get('DASHBOARD_WARM_TOP_N', 20))
+WARM_INTERVAL_SECONDS = float(os.environ.get('DASHBOARD_WARM_INTERVAL', 900))
+# Share of one core the warmer may use, and the resident memory it stops at
+WARM_CPU_BUDGET = float(os.environ.get('DASHBOARD_WARM_CPU_BUDGET', 0.25))
+WARM_MEMORY_MB = float(os.environ.get('DASHBOARD_WARM_MEMORY_MB', 1024))
+WARM_IDLE_SECONDS = 2.0
+# Read back at startup to choose what to warm, so it lives with the other app state, not in /tmp
+STATS_FILE = os.path.join(DATA_DIR, "request_stats.json")
+
+request_stats = Counter()
+request_stats_lock = threading.Lock()
+signature_filters = OrderedDict()
+last_request_time = 0.0
+warm_stop = threading.Event()
+warm_wakeup = threading.Event()
+
+def note_activity():
+    global last_request_time
+    last_request_time = time.monotonic()
+
+def remember_signature(signature, key):
+    """Map a filtered-data signature back to the filter selection that produced it."""
+    with request_stats_lock:
+        signature_filters[signature] = key
+        signature_filters.move_to_end(signature)
+        while len(signature_filters) > RESULT_CACHE_SIZE:
+            signature_filters.popitem(last=False)
+
+def record_request(tab, signature, metric):
+    note_activity()
+    with request_stats_lock:
+        key = signature_filters.get(signature)
+        if key is not None:
+            request_stats[(key, tab, metric)] += 1
+
+def read_combinations(path):
+    with open(path) as f:
+        entries = json.load(f)
+    return Counter({
+        (tuple(entry['filters']), entry['tab'], entry['metric']): entry.get('count', 0)
+        for entry in entries
+    })
+
+def load_request_stats():
+    if os.path.exists(STATS_FILE):
+        try:
+            with request_stats_lock:
+                request_stats.update(read_combinations(STATS_FILE))
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Error loading request stats: {str(e)}")
+
+def save_request_stats():
+    with request_stats_lock:
+        entries = [
+            {'filters': list(key), 'tab': tab, 'metric': metric, 'count': count}
+            for (key, tab, metric), count in request_stats.most_common()
+        ]
+    try:
+        os.makedirs(os.path.dirname(STATS_FILE), mode=0o700, exist_ok=True)
+        # Every worker writes this file; replace it whole so readers never see a partial write
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(STATS_FILE), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(temp_path, STATS_FILE)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logging.error(f"Error saving request stats: {str(e)}")
+
+def warm_combinations():
+    """Configured combinations first, then the most requested ones, then the landing views."""
+    combos = []
+    if WARM_CONFIG_FILE:
+        try:
+            combos.extend(read_combinations(WARM_CONFIG_FILE))
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Error reading warm config: {str(e)}")
+    with request_stats_lock:
+        combos.extend(combo for combo, _ in request_stats.most_common(WARM_TOP_N))
+    start, end = date_bounds()
+    full_range = ('All', 'All', 'All', 'All') + tuple(d.strftime('%Y-%m-%d') if d is not None else None for d in (start, end))
+    for key in (DEFAULT_FILTERS, full_range):
+        for tab in ['tab-kpi', 'tab-trends', 'tab-3d']:
+            combos.append((key, tab, 'Sale Price'))
+    for tab in sorted(FILTER_INDEPENDENT_TABS):
+        combos.append((DEFAULT_FILTERS, tab, 'Sale Price'))
+    return list(OrderedDict.fromkeys(combos))
+
+def resident_memory_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+def warm_combination(key, tab, metric):
+    payload = filter_sales(*key)[0]
+    signature = filter_signature(payload)
+    cached_tab_content(tab, payload, metric, signature)
+    if tab == 'tab-trends':
+        trend_series(payload, metric, None, signature)
+    elif tab == 'tab-model':
+        update_model_graph('Car Model', 'box', list(key), metric)
+    elif tab == 'tab-vehicle':
+        update_vehicle_graph('units', 'sunburst', list(key))
+    return signature
+
+def warm_caches():
+    """Precompute results and figures for each combination until done, interrupted or over budget."""
+    warmed = 0
+    for key, tab, metric in warm_combinations():
+        # Foreground requests win: wait for a quiet moment before each item
+        while time.monotonic() - last_request_time < WARM_IDLE_SECONDS and not warm_stop.is_set():
+            warm_stop.wait(0.2)
+        if warm_stop.is_set() or warm_wakeup.is_set():
+            break
+        if resident_memory_mb() > WARM_MEMORY_MB:
+            logging.info(f"Cache warmer stopped at memory budget ({WARM_MEMORY_MB:.0f} MB)")
+            break
+        started = time.thread_time()
+        try:
+            warm_combination(key, tab, metric)
+            warmed += 1
+        except Exception as e:
+            logging.error(f"Error warming {tab} for {key}: {str(e)}")
+        spent = time.thread_time() - started
+        # Rest long enough to keep this thread within WARM_CPU_BUDGET of a core
+        warm_stop.wait(spent * (1 / WARM_CPU_BUDGET - 1))
+    logging.info(f"Cache warmer primed {warmed} combinations")
+    return warmed
+
+def cache_warmer_loop():
+    try:
+        # Lowest scheduling priority for this thread only (Linux)
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+    load_request_stats()
+    while not warm_stop.is_set():
+        warm_wakeup.clear()
+        warm_caches()
+        save_request_stats()
+        warm_wakeup.wait(WARM_INTERVAL_SECONDS)
+
+def stop_cache_warmer():
+    warm_stop.set()
+    warm_wakeup.set()
+    save_request_stats()
+
+# Pool workers started from `python dash_app.py` re-import this file; only the parent runs threads
+if WARM_ENABLED and not df.empty and multiprocessing.parent_process() is None:
+    threading.Thread(target=cache_warmer_loop, name="cache-warmer", daemon=True).start()
+    atexit.register(stop_cache_warmer)
+
+if LIVE_INGEST and multiprocessing.parent_process() is None:
+    threading.Thread(target=ingest_loop, name="sales-ingest", daemon=True).start()
+    atexit.register(ingest_stop.set)
 
 if __name__ == '__main__':
     app.run_server(debug=False, host='0.0.0.0', port=8050)
@@ -0,0 +1,449 @@
+"""
+Local load generator for the Automotive Analytics Dashboard.
+
+Drives the real Dash endpoints (``/_dash-layout``, ``/_dash-dependencies`` and
+``/_dash-update-component``) with N simulated analyst sessions that follow
+click scripts, then reports throughput and p50/p90/p99 latency per callback.
+
+Callbacks are resolved from ``/_dash-dependencies`` by output component id, so
+the scripts keep working when callbacks gain outputs or inputs.
+
+Examples:
+    # Against an already running server
+    python load_test.py --url http://127.0.0.1:8050 --sessions 20 --duration 60
+
+    # Spawn gunicorn once per worker class and compare them
+    python load_test.py --worker-classes sync gthread gevent --workers 2 --threads 4
+
+Only meant for local use; do not point it at a shared deployment.
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+TABS = [
+    'tab-kpi', 'tab-3d', 'tab-heatmap', 'tab-top', 'tab-vehicle', 'tab-model',
+    'tab-trends', 'tab-hr', 'tab-inventory', 'tab-crm', 'tab-demo'
+]
+SEARCH_TERMS = ['br', 'filter', 'toyota', 'pump', 'ford', 'sensor']
+
+# gunicorn worker classes and the module each one needs to be importable
+WORKER_CLASS_REQUIREMENTS = {
+    'sync': None,
+    'gthread': None,
+    'gevent': 'gevent',
+    'eventlet': 'eventlet',
+}
+
+
+class DashClient:
+    """Keep-alive HTTP client for a single simulated session."""
+
+    def __init__(self, base_url, timeout=60):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self.conn = None
+
+    def _request(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        payload = json.dumps(body) if body is not None else None
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                start = time.perf_counter()
+                self.conn.request(method, path, body=payload, headers=headers)
+                resp = self.conn.getresponse()
+                data = resp.read()
+                elapsed = time.perf_counter() - start
+                return resp.status, data, elapsed
+            except (http.client.HTTPException, OSError):
+                # Sync workers close the connection after every response
+                self.close()
+                if attempt:
+                    raise
+        return None
+
+    def get(self, path):
+        return self._request('GET', path)
+
+    def post(self, path, body):
+        return self._request('POST', path, body)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class Recorder:
+    """Thread-safe collection of latency samples keyed by callback label."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, label, elapsed, ok):
+        with self.lock:
+            if ok:
+                self.samples[label].append(elapsed)
+            else:
+                self.errors[label] += 1
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def walk_layout(node, props):
+    """Collect the initial property values of every component with an id."""
+    if isinstance(node, list):
+        for child in node:
+            walk_layout(child, props)
+        return
+    if not isinstance(node, dict) or 'props' not in node:
+        return
+    node_props = node['props']
+    component_id = node_props.get('id')
+    for key, value in node_props.items():
+        if key == 'children':
+            walk_layout(value, props)
+        elif component_id is not None and isinstance(component_id, str):
+            props[(component_id, key)] = value
+
+
+def index_callbacks(dependencies):
+    """Map every server-side output component id to its callback spec."""
+    callbacks = {}
+    for dep in dependencies:
+        if dep.get('clientside_function'):
+            continue
+        output = dep['output']
+        if output.startswith('..') and output.endswith('..'):
+            parts = output[2:-2].split('...')
+        else:
+            parts = [output]
+        outputs = []
+        for part in parts:
+            component_id, prop = part.rsplit('.', 1)
+            outputs.append({'id': component_id, 'property': prop.split('@')[0]})
+        spec = dict(dep, outputs_list=outputs, multi=len(parts) > 1 or output.startswith('..'))
+        for out in outputs:
+            callbacks.setdefault(out['id'], spec)
+    return callbacks
+
+
+class Session:
+    """One simulated analyst: holds component state and replays a click script."""
+
+    def __init__(self, base_url, recorder, think_time, rng):
+        self.client = DashClient(base_url)
+        self.recorder = recorder
+        self.think_time = think_time
+        self.rng = rng
+        self.props = {}
+        self.callbacks = {}
+
+    def _timed_get(self, label, path):
+        try:
+            status, data, elapsed = self.client.get(path)
+        except OSError:
+            self.recorder.record(label, 0.0, False)
+            return None
+        self.recorder.record(label, elapsed, status == 200)
+        return data if status == 200 else None
+
+    def load(self):
+        self._timed_get('GET /', '/')
+        layout = self._timed_get('_dash-layout', '/_dash-layout')
+        dependencies = self._timed_get('_dash-dependencies', '/_dash-dependencies')
+        if layout is None or dependencies is None:
+            return False
+        walk_layout(json.loads(layout), self.props)
+        self.callbacks = index_callbacks(json.loads(dependencies))
+        return True
+
+    def set(self, component_id, prop, value):
+        self.props[(component_id, prop)] = value
+
+    def click(self, component_id):
+        self.props[(component_id, 'n_clicks')] = (self.props.get((component_id, 'n_clicks')) or 0) + 1
+
+    def fire(self, label, output_id, changed=()):
+        spec = self.callbacks.get(output_id)
+        if spec is None:
+            return False
+        body = {
+            'output': spec['output'],
+            'outputs': spec['outputs_list'] if spec['multi'] else spec['outputs_list'][0],
+            'inputs': [
+                {'id': i['id'], 'property': i['property'], 'value': self.props.get((i['id'], i['property']))}
+                for i in spec['inputs']
+            ],
+            'state': [
+                {'id': s['id'], 'property': s['property'], 'value': self.props.get((s['id'], s['property']))}
+                for s in spec.get('state', [])
+            ],
+            'changedPropIds': [f"{c[0]}.{c[1]}" for c in changed],
+        }
+        try:
+            status, data, elapsed = self.client.post('/_dash-update-component', body)
+        except OSError:
+            self.recorder.record(label, 0.0, False)
+            return False
+        # 204 means PreventUpdate, which is a valid answer
+        ok = status in (200, 204)
+        self.recorder.record(label, elapsed, ok)
+        if status == 200:
+            response = json.loads(data).get('response', {})
+            for component_id, values in response.items():
+                for prop, value in values.items():
+                    self.props[(component_id, prop)] = value
+        return ok
+
+    def pause(self):
+        if self.think_time > 0:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.think_time)
+
+    def _option_values(self, component_id):
+        options = self.props.get((component_id, 'options')) or []
+        return [o['value'] for o in options if isinstance(o, dict) and o.get('value') != 'All']
+
+    def render_tab(self, tab):
+        self.set('tabs', 'value', tab)
+        self.fire(f'render_tab_content[{tab}]', 'tabs-content', [('tabs', 'value')])
+
+    def run_script(self):
+        """Initial load, a few filter changes, tab browsing and searches."""
+        self.fire('apply_filters', 'filtered-data')
+        self.render_tab('tab-kpi')
+        self.pause()
+
+        for _ in range(self.rng.randint(1, 3)):
+            salespeople = self._option_values('salespeople-dropdown')
+            makes = self._option_values('car-makes-dropdown')
+            if salespeople and self.rng.random() < 0.5:
+                self.set('salespeople-dropdown', 'value', self.rng.choice(salespeople))
+            if makes:
+                self.set('car-makes-dropdown', 'value', self.rng.choice(makes))
+                self.fire('update_car_models', 'car-models-dropdown', [('car-makes-dropdown', 'value')])
+            self.click('apply-filters')
+            self.fire('apply_filters', 'filtered-data', [('apply-filters', 'n_clicks')])
+            self.render_tab(self.props.get(('tabs', 'value')) or 'tab-kpi')
+            self.pause()
+
+            for tab in self.rng.sample(TABS, 3):
+                self.render_tab(tab)
+                self.pause()
+
+        self.render_tab('tab-inventory')
+        self.set('inventory-search', 'value', self.rng.choice(SEARCH_TERMS))
+        self.fire('update_inventory_table', 'inventory-table', [('inventory-search', 'value')])
+        self.pause()
+
+        self.render_tab('tab-crm')
+        self.set('crm-search', 'value', self.rng.choice(SEARCH_TERMS))
+        self.fire('update_crm_table', 'crm-table', [('crm-search', 'value')])
+        self.pause()
+
+        self.click('clear-filters')
+        self.fire('apply_filters', 'filtered-data', [('clear-filters', 'n_clicks')])
+        self.render_tab('tab-kpi')
+
+
+def run_load(base_url, sessions, duration, think_time, seed):
+    """Run `sessions` concurrent looping sessions for `duration` seconds."""
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+    completed = [0]
+    completed_lock = threading.Lock()
+
+    def worker(index):
+        session = Session(base_url, recorder, think_time, random.Random(seed + index))
+        try:
+            if not session.load():
+                return
+            while time.monotonic() < deadline:
+                session.run_script()
+                with completed_lock:
+                    completed[0] += 1
+        finally:
+            session.client.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(sessions)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.monotonic() - started
+    return summarize(recorder, wall, completed[0])
+
+
+def summarize(recorder, wall, scripts_completed):
+    rows = []
+    everything = []
+    for label in sorted(set(recorder.samples) | set(recorder.errors)):
+        values = sorted(recorder.samples.get(label, []))
+        everything.extend(values)
+        rows.append({
+            'callback': label,
+            'count': len(values),
+            'errors': recorder.errors.get(label, 0),
+            'rps': len(values) / wall if wall else 0.0,
+            'p50_ms': percentile(values, 50) * 1000,
+            'p90_ms': percentile(values, 90) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': (values[-1] * 1000) if values else 0.0,
+        })
+    everything.sort()
+    return {
+        'wall_seconds': wall,
+        'requests': len(everything),
+        'errors': sum(recorder.errors.values()),
+        'throughput_rps': len(everything) / wall if wall else 0.0,
+        'p50_ms': percentile(everything, 50) * 1000,
+        'p99_ms': percentile(everything, 99) * 1000,
+        'scripts_completed': scripts_completed,
+        'callbacks': rows,
+    }
+
+
+def print_report(title, summary):
+    print(f"\n=== {title} ===")
+    print(
+        f"{summary['requests']:,} requests in {summary['wall_seconds']:.1f}s "
+        f"({summary['throughput_rps']:.1f} req/s), {summary['scripts_completed']} scripts completed"
+    )
+    print(f"{'callback':<34}{'count':>8}{'err':>6}{'req/s':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for row in summary['callbacks']:
+        print(
+            f"{row['callback']:<34}{row['count']:>8}{row['errors']:>6}{row['rps']:>9.1f}"
+            f"{row['p50_ms']:>10.1f}{row['p90_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}"
+        )
+
+
+def print_comparison(results):
+    print("\n=== Worker class comparison ===")
+    print(f"{'worker class':<16}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for worker_class, summary in results.items():
+        print(
+            f"{worker_class:<16}{summary['throughput_rps']:>10.1f}{summary['p50_ms']:>10.1f}"
+            f"{summary['p99_ms']:>10.1f}{summary['errors']:>8}"
+        )
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(base_url, timeout, proc=None):
+    client = DashClient(base_url, timeout=5)
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            if proc is not None and proc.poll() is not None:
+                return False
+            try:
+                status, _, _ = client.get('/_dash-layout')
+                if status == 200:
+                    return True
+            except OSError:
+                client.close()
+            time.sleep(0.5)
+        return False
+    finally:
+        client.close()
+
+
+def spawn_gunicorn(app_path, worker_class, workers, threads, port):
+    cmd = [
+        sys.executable, '-m', 'gunicorn', app_path,
+        '--bind', f'127.0.0.1:{port}',
+        '--worker-class', worker_class,
+        '--workers', str(workers),
+        '--log-level', 'warning',
+        '--timeout', '120',
+    ]
+    if worker_class == 'gthread':
+        cmd += ['--threads', str(threads)]
+    elif worker_class in ('gevent', 'eventlet'):
+        cmd += ['--worker-connections', str(max(threads, 100))]
+    return subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="Target an already running server instead of spawning gunicorn")
+    parser.add_argument('--sessions', type=int, default=10, help="Concurrent simulated sessions")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run each configuration")
+    parser.add_argument('--think-time', type=float, default=0.2, help="Mean pause between clicks in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--app', default='dash_app:server', help="WSGI app path passed to gunicorn")
+    parser.add_argument('--worker-classes', nargs='+', default=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help="Threads per gthread worker")
+    parser.add_argument('--startup-timeout', type=float, default=60.0)
+    parser.add_argument('--json', dest='json_path', help="Also write the raw results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {}
+
+    if args.url:
+        summary = run_load(args.url, args.sessions, args.duration, args.think_time, args.seed)
+        print_report(args.url, summary)
+        results[args.url] = summary
+    else:
+        for worker_class in args.worker_classes:
+            requirement = WORKER_CLASS_REQUIREMENTS.get(worker_class)
+            if requirement and importlib.util.find_spec(requirement) is None:
+                print(f"Skipping {worker_class}: `{requirement}` is not installed")
+                continue
+            port = free_port()
+            base_url = f'http://127.0.0.1:{port}'
+            proc = spawn_gunicorn(args.app, worker_class, args.workers, args.threads, port)
+            try:
+                if not wait_until_ready(base_url, args.startup_timeout, proc):
+                    print(f"Skipping {worker_class}: server did not become ready")
+                    continue
+                summary = run_load(base_url, args.sessions, args.duration, args.think_time, args.seed)
+                print_report(f"{worker_class} ({args.workers} workers)", summary)
+                results[worker_class] = summary
+            finally:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+        if len(results) > 1:
+            print_comparison(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
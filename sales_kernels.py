@@ -0,0 +1,78 @@
+"""
+Partition kernels for the dashboard's parallel sales aggregation.
+
+Pool workers start from a fresh interpreter and import this module by name to
+run these functions, so it must stay free of import side effects: no data
+generation, app or thread setup, only numpy and pure functions over column
+arrays.
+"""
+import numpy as np
+from multiprocessing import shared_memory
+
+AGG_COLUMNS = ['Salesperson', 'Car Make', 'Car Model', 'Car Year', 'Month', 'Sale Price', 'Commission Earned']
+
+# Worker side: shared blocks mapped by this process, keyed by block name
+_worker_columns = {}
+
+def filter_mask(columns, lo, hi, filters):
+    mask = np.ones(hi - lo, dtype=bool)
+    for col, code in filters.items():
+        mask &= columns[col][lo:hi] == code
+    return mask
+
+def aggregate_partition(columns, lo, hi, filters, mask=None):
+    """Partial count, sums and per-month sums for rows [lo, hi) matching `filters`."""
+    if mask is None:
+        mask = filter_mask(columns, lo, hi, filters)
+    price = columns['Sale Price'][lo:hi][mask].astype(np.float64)
+    commission = columns['Commission Earned'][lo:hi][mask].astype(np.float64)
+    months = columns['Month'][lo:hi][mask].astype(np.int64) - columns['month_base']
+    n_months = columns['n_months']
+    return {
+        'count': int(mask.sum()),
+        'sale_sum': float(price.sum()),
+        'commission_sum': float(commission.sum()),
+        'month_count': np.bincount(months, minlength=n_months),
+        'month_sale': np.bincount(months, weights=price, minlength=n_months),
+        'month_commission': np.bincount(months, weights=commission, minlength=n_months),
+    }
+
+def compare_partition(columns, lo, hi, side_a, side_b):
+    """Per (label, month) counts and sums for rows [lo, hi); label 1 is A only, 2 B only, 3 both.
+
+    Each side is ((start, stop), filters) with the side's own row range.
+    """
+    label = np.zeros(hi - lo, dtype=np.int8)
+    for bit, ((start, stop), filters) in ((1, side_a), (2, side_b)):
+        start, stop = max(start, lo), min(stop, hi)
+        if stop > start:
+            window = label[start - lo:stop - lo]
+            window[filter_mask(columns, start, stop, filters)] |= bit
+    matched = label > 0
+    n_months = columns['n_months']
+    months = columns['Month'][lo:hi][matched].astype(np.int64) - columns['month_base']
+    cells = label[matched].astype(np.int64) * n_months + months
+    size = 4 * n_months
+    return {
+        'count': np.bincount(cells, minlength=size),
+        'sale': np.bincount(cells, weights=columns['Sale Price'][lo:hi][matched].astype(np.float64), minlength=size),
+        'commission': np.bincount(cells, weights=columns['Commission Earned'][lo:hi][matched].astype(np.float64), minlength=size),
+    }
+
+def attach_shared_columns(meta):
+    """Map shared blocks once per process and drop mappings of older generations."""
+    names = {meta[col][0] for col in AGG_COLUMNS}
+    for name in list(_worker_columns):
+        if name not in names:
+            _worker_columns.pop(name)[0].close()
+    columns = {key: value for key, value in meta.items() if key not in AGG_COLUMNS}
+    for col in AGG_COLUMNS:
+        name, dtype, length = meta[col]
+        if name not in _worker_columns:
+            block = shared_memory.SharedMemory(name=name)
+            _worker_columns[name] = (block, np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf))
+        columns[col] = _worker_columns[name][1]
+    return columns
+
+def run_shared_partition(partition, meta, lo, hi, *args):
+    return partition(attach_shared_columns(meta), lo, hi, *args)